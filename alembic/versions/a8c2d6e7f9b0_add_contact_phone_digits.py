@@ -0,0 +1,75 @@
+"""add_contact_phone_digits
+
+Revision ID: a8c2d6e7f9b0
+Revises: f7a1b5c6d8e9
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.phone import normalize_phone
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8c2d6e7f9b0'
+down_revision: Union[str, Sequence[str], None] = 'f7a1b5c6d8e9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 5000
+
+contacts = sa.table(
+    'contacts',
+    sa.column('id', sa.Integer()),
+    sa.column('phone_number', sa.String()),
+    sa.column('phone_digits', sa.String()),
+    sa.column('phone_digits_reversed', sa.String()),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('contacts', sa.Column('phone_digits', sa.String(length=20), nullable=True))
+    op.add_column('contacts', sa.Column('phone_digits_reversed', sa.String(length=20), nullable=True))
+
+    # Backfill in batches of ids so no single statement rewrites the table.
+    connection = op.get_bind()
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(contacts.c.id, contacts.c.phone_number)
+            .where(contacts.c.id > last_id)
+            .order_by(contacts.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        values = []
+        for contact_id, phone_number in rows:
+            digits = normalize_phone(phone_number)
+            values.append({'contact_id': contact_id, 'digits': digits, 'reversed': digits[::-1]})
+        connection.execute(
+            contacts.update()
+            .where(contacts.c.id == sa.bindparam('contact_id'))
+            .values(phone_digits=sa.bindparam('digits'), phone_digits_reversed=sa.bindparam('reversed')),
+            values,
+        )
+        last_id = rows[-1].id
+
+    op.alter_column('contacts', 'phone_digits', nullable=False)
+    op.alter_column('contacts', 'phone_digits_reversed', nullable=False)
+    op.create_index('ix_contacts_user_id_phone_digits', 'contacts', ['user_id', 'phone_digits'], unique=False,
+                    postgresql_ops={'phone_digits': 'varchar_pattern_ops'})
+    op.create_index('ix_contacts_user_id_phone_digits_reversed', 'contacts', ['user_id', 'phone_digits_reversed'],
+                    unique=False, postgresql_ops={'phone_digits_reversed': 'varchar_pattern_ops'})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_contacts_user_id_phone_digits_reversed', table_name='contacts')
+    op.drop_index('ix_contacts_user_id_phone_digits', table_name='contacts')
+    op.drop_column('contacts', 'phone_digits_reversed')
+    op.drop_column('contacts', 'phone_digits')
@@ -0,0 +1,28 @@
+"""add_avatar_urls_to_users
+
+Revision ID: c4d8e1f2a3b5
+Revises: 2357eca0c4e7
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d8e1f2a3b5'
+down_revision: Union[str, Sequence[str], None] = '2357eca0c4e7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('avatar_urls', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'avatar_urls')
@@ -0,0 +1,28 @@
+"""add_contact_shard_to_users
+
+Revision ID: d5e9f3a4b6c7
+Revises: c4d8e1f2a3b5
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5e9f3a4b6c7'
+down_revision: Union[str, Sequence[str], None] = 'c4d8e1f2a3b5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('contact_shard', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'contact_shard')
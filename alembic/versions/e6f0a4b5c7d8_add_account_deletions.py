@@ -0,0 +1,45 @@
+"""add_account_deletions
+
+Revision ID: e6f0a4b5c7d8
+Revises: d5e9f3a4b6c7
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6f0a4b5c7d8'
+down_revision: Union[str, Sequence[str], None] = 'd5e9f3a4b6c7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('deletion_pending', sa.Boolean(), server_default='false', nullable=False))
+
+    op.create_table('account_deletions',
+        sa.Column('id', sa.String(length=32), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.Enum('PENDING', 'RUNNING', 'COMPLETED', 'FAILED', name='accountdeletionstatus'),
+                  nullable=False),
+        sa.Column('total_contacts', sa.Integer(), nullable=False),
+        sa.Column('deleted_contacts', sa.Integer(), nullable=False),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_account_deletions_user_id'), 'account_deletions', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_account_deletions_user_id'), table_name='account_deletions')
+    op.drop_table('account_deletions')
+    sa.Enum(name='accountdeletionstatus').drop(op.get_bind(), checkfirst=True)
+    op.drop_column('users', 'deletion_pending')
@@ -0,0 +1,27 @@
+"""add_contacts_user_id_index
+
+Revision ID: f7a1b5c6d8e9
+Revises: e6f0a4b5c7d8
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7a1b5c6d8e9'
+down_revision: Union[str, Sequence[str], None] = 'e6f0a4b5c7d8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_contacts_user_id'), 'contacts', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_contacts_user_id'), table_name='contacts')
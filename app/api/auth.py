@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Request, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Request, Response, UploadFile, File
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from datetime import timedelta
@@ -6,20 +6,25 @@ from slowapi import Limiter
 from slowapi.util import get_remote_address
 
 from app.db.database import get_db
+from app.db.replica import get_recent_writes
 from app.services.user_service import UserService, UserAlreadyExistsError
-from app.schemas.user import UserCreate, UserResponse, Token, RefreshTokenRequest
+from app.schemas.user import UserCreate, UserResponse, Token, RefreshTokenRequest, AccountDeletionResponse
 from app.core.security import (
     create_access_token,
     create_refresh_token,
     decode_refresh_token,
     get_current_user,
     create_email_verification_token,
-    verify_email_token
+    verify_email_token,
+    create_account_deletion_token,
+    verify_account_deletion_token,
+    oauth2_scheme
 )
 from app.core.config import settings
 from app.domain.user import User
-from app.services.email_service import send_verification_email
-from app.services.cloudinary_service import cloudinary_service
+from app.services.email_service import send_verification_email, enqueue_email
+from app.services.avatar_service import avatar_service
+from app.services.account_deletion_service import AccountDeletionService, run_account_deletion
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -30,18 +35,24 @@ def get_user_service(db: Session = Depends(get_db)) -> UserService:
     return UserService(db)
 
 
+def get_account_deletion_service(db: Session = Depends(get_db)) -> AccountDeletionService:
+    return AccountDeletionService(db)
+
+
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-async def register(
+def register(
     user_data: UserCreate,
     background_tasks: BackgroundTasks,
     service: UserService = Depends(get_user_service)
 ):
     try:
         user = service.create_user(user_data)
+        get_recent_writes().mark(user.email)
 
         verification_token = create_email_verification_token(user.email)
 
-        background_tasks.add_task(
+        enqueue_email(
+            background_tasks,
             send_verification_email,
             user.email,
             user.first_name or user.email.split('@')[0],
@@ -80,6 +91,7 @@ def login(
     )
 
     service.save_refresh_token(user.id, refresh_token)
+    get_recent_writes().mark(user.email)
 
     return Token(
         access_token=access_token,
@@ -152,6 +164,7 @@ async def verify_email(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="User not found"
             )
+        get_recent_writes().mark(email)
 
         return {
             "message": "Email verified successfully",
@@ -185,7 +198,8 @@ async def resend_verification_email(
 
     verification_token = create_email_verification_token(user.email)
 
-    background_tasks.add_task(
+    enqueue_email(
+        background_tasks,
         send_verification_email,
         user.email,
         user.first_name or user.email.split('@')[0],
@@ -210,9 +224,9 @@ async def update_avatar(
     current_user: User = Depends(get_current_user),
     service: UserService = Depends(get_user_service)
 ):
-    avatar_url = await cloudinary_service.upload_avatar(file, current_user.id)
+    avatar_urls = await avatar_service.upload_avatar(file, current_user.id)
 
-    updated_user = service.update_avatar(current_user.id, avatar_url)
+    updated_user = service.update_avatar(current_user.id, avatar_urls)
 
     if not updated_user:
         raise HTTPException(
@@ -221,3 +235,43 @@ async def update_avatar(
         )
 
     return updated_user
+
+
+@router.delete("/me", response_model=AccountDeletionResponse)
+def delete_account(
+    response: Response,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_user),
+    service: AccountDeletionService = Depends(get_account_deletion_service)
+):
+    job = service.start_deletion(current_user)
+    # Keeps this user's authentication on the primary, where
+    # deletion_pending is already set, until the replica has it too.
+    get_recent_writes().mark(current_user.email)
+
+    if service.is_small(job):
+        run_account_deletion(job.id)
+        service.db.refresh(job)
+    else:
+        background_tasks.add_task(run_account_deletion, job.id)
+        response.status_code = status.HTTP_202_ACCEPTED
+
+    return AccountDeletionResponse.model_validate(job).model_copy(
+        update={"status_token": create_account_deletion_token(job.id)}
+    )
+
+
+@router.get("/deletions/{job_id}", response_model=AccountDeletionResponse)
+def get_account_deletion(
+    job_id: str,
+    token: str = Depends(oauth2_scheme),
+    service: AccountDeletionService = Depends(get_account_deletion_service)
+):
+    # A token for another job gets the same 404 as an unknown id.
+    job = service.get_deletion(job_id) if verify_account_deletion_token(token, job_id) else None
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Account deletion not found"
+        )
+    return job
@@ -1,28 +1,76 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from typing import Optional
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query, Response
+from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
-from app.db.database import get_db
+from app.db.replica import get_read_db
+from app.db.sharding import shard_router
 from app.services.contact_service import (
     ContactService,
     ContactAlreadyExistsError,
     ContactNotFoundError
 )
+from app.services.duplicate_service import get_duplicate_finder
 from app.schemas.contact import (
     ContactCreate,
     ContactUpdate,
     ContactResponse,
-    ContactListResponse
+    ContactListResponse,
+    ContactBatchRequest,
+    ContactBatchResponse,
+    DuplicateReport,
+    CONTACT_FIELDS,
+    contact_projection
 )
+from app.api.routing import MsgPackRoute
+from app.core.responses import NegotiatedResponse
 from app.core.security import get_current_user
 from app.domain.user import User
 
-router = APIRouter(prefix="/contacts", tags=["contacts"])
+router = APIRouter(
+    prefix="/contacts",
+    tags=["contacts"],
+    route_class=MsgPackRoute,
+    default_response_class=NegotiatedResponse,
+)
+
+
+FIELDS_DESCRIPTION = "Comma-separated contact fields to return (sparse fieldset), e.g. first_name,last_name"
+
+
+# get_read_db only hands out the replica for GET requests, so write routes
+# keep using the primary session. With shards configured, contacts are read
+# and written on the current user's shard instead.
+def get_contact_db(
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    with shard_router.contact_session(current_user, db) as contact_db:
+        yield contact_db
 
 
-def get_contact_service(db: Session = Depends(get_db)) -> ContactService:
+def get_contact_service(db: Session = Depends(get_contact_db)) -> ContactService:
     return ContactService(db)
 
 
+def parse_fields(fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)) -> Optional[frozenset[str]]:
+    if fields is None:
+        return None
+    selected = frozenset(name.strip() for name in fields.split(",") if name.strip())
+    unknown = selected - CONTACT_FIELDS
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+        )
+    return selected | {"id"}
+
+
+def projected_response(model: BaseModel) -> Response:
+    return NegotiatedResponse(model.model_dump(mode="json"))
+
+
 @router.post("/", response_model=ContactResponse, status_code=status.HTTP_201_CREATED)
 def create_contact(
     contact_data: ContactCreate,
@@ -39,15 +87,29 @@ def create_contact(
         )
 
 
+@router.post("/batch", response_model=ContactBatchResponse)
+def batch_contacts(
+    batch: ContactBatchRequest,
+    service: ContactService = Depends(get_contact_service),
+    current_user: User = Depends(get_current_user)
+):
+    return service.execute_batch(batch.operations, current_user.id, batch.atomic)
+
+
 @router.get("/", response_model=ContactListResponse)
 def get_contacts(
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100),
+    fields: Optional[frozenset[str]] = Depends(parse_fields),
     service: ContactService = Depends(get_contact_service),
     current_user: User = Depends(get_current_user)
 ):
     skip = (page - 1) * page_size
-    contacts, total = service.get_all_contacts(current_user.id, skip=skip, limit=page_size)
+    contacts, total = service.get_all_contacts(current_user.id, skip=skip, limit=page_size, fields=fields)
+
+    if fields is not None:
+        _, list_model = contact_projection(fields)
+        return projected_response(list_model(contacts=contacts, total=total, page=page, page_size=page_size))
 
     return ContactListResponse(
         contacts=contacts,
@@ -62,11 +124,16 @@ def search_contacts(
     q: str = Query(..., min_length=1),
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100),
+    fields: Optional[frozenset[str]] = Depends(parse_fields),
     service: ContactService = Depends(get_contact_service),
     current_user: User = Depends(get_current_user)
 ):
     skip = (page - 1) * page_size
-    contacts, total = service.search_contacts(q, current_user.id, skip=skip, limit=page_size)
+    contacts, total = service.search_contacts(q, current_user.id, skip=skip, limit=page_size, fields=fields)
+
+    if fields is not None:
+        _, list_model = contact_projection(fields)
+        return projected_response(list_model(contacts=contacts, total=total, page=page, page_size=page_size))
 
     return ContactListResponse(
         contacts=contacts,
@@ -92,14 +159,54 @@ def get_upcoming_birthdays(
         )
 
 
+@router.get("/by-phone", response_model=list[ContactResponse])
+def find_contacts_by_phone(
+    number: str = Query(..., min_length=1, max_length=30),
+    suffix: bool = Query(False, description="Match numbers ending with these digits (at least 4)"),
+    service: ContactService = Depends(get_contact_service),
+    current_user: User = Depends(get_current_user)
+):
+    try:
+        return service.find_by_phone(current_user.id, number, suffix)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+@router.get("/duplicates", response_model=DuplicateReport)
+def find_duplicates(
+    response: Response,
+    background_tasks: BackgroundTasks,
+    limit: int = Query(50, ge=1, le=500),
+    refresh: bool = Query(False, description="Rescan instead of using the cached report"),
+    db: Session = Depends(get_contact_db),
+    current_user: User = Depends(get_current_user)
+):
+    duplicate_finder = get_duplicate_finder()
+    report = duplicate_finder.get(current_user.id, db, refresh)
+    if report is None:
+        # Large book: scanned in the background, poll until status is ready.
+        if duplicate_finder.schedule(current_user.id):
+            background_tasks.add_task(duplicate_finder.run_scan, current_user.id)
+        response.status_code = status.HTTP_202_ACCEPTED
+        return DuplicateReport(status="pending")
+    return report.model_copy(update={"groups": report.groups[:limit]})
+
+
 @router.get("/{contact_id}", response_model=ContactResponse)
 def get_contact(
     contact_id: int,
+    fields: Optional[frozenset[str]] = Depends(parse_fields),
     service: ContactService = Depends(get_contact_service),
     current_user: User = Depends(get_current_user)
 ):
     try:
-        contact = service.get_contact(contact_id, current_user.id)
+        contact = service.get_contact(contact_id, current_user.id, fields)
+        if fields is not None:
+            item_model, _ = contact_projection(fields)
+            return projected_response(item_model.model_validate(contact))
         return contact
     except ContactNotFoundError as e:
         raise HTTPException(
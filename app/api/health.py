@@ -0,0 +1,25 @@
+from fastapi import APIRouter, status
+
+from app.core.responses import FastJSONResponse
+from app.services.health_service import readiness_service
+
+router = APIRouter(tags=["health"])
+
+
+@router.get("/health")
+def health_check():
+    return {"status": "ok"}
+
+
+@router.get("/health/live")
+def liveness_check():
+    return {"status": "ok"}
+
+
+@router.get("/health/ready")
+async def readiness_check():
+    ready, report = await readiness_service.check()
+    return FastJSONResponse(
+        status_code=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content=report,
+    )
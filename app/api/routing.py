@@ -0,0 +1,50 @@
+from typing import Callable
+
+import msgpack
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+
+from app.core.responses import MSGPACK_MEDIA_TYPES, response_format
+
+
+def accepts_msgpack(accept: str) -> bool:
+    for item in accept.split(","):
+        media_type, _, params = item.strip().partition(";")
+        if media_type.strip().lower() in MSGPACK_MEDIA_TYPES:
+            return params.replace(" ", "") not in ("q=0", "q=0.0")
+    return False
+
+
+class MsgPackRequest(Request):
+    async def json(self):
+        if not hasattr(self, "_json"):
+            self._json = msgpack.unpackb(await self.body())
+        return self._json
+
+
+class MsgPackRoute(APIRoute):
+    # Reuses the route's pydantic schemas for MessagePack: request bodies are
+    # unpacked in place of JSON, and NegotiatedResponse packs the response
+    # when the client asked for it.
+    def get_route_handler(self) -> Callable:
+        original_route_handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            token = response_format.set(
+                "msgpack" if accepts_msgpack(request.headers.get("accept", "")) else "json"
+            )
+            try:
+                content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+                if content_type in MSGPACK_MEDIA_TYPES:
+                    # FastAPI only calls request.json() for JSON content types.
+                    scope = dict(request.scope)
+                    scope["headers"] = [
+                        (name, b"application/json" if name == b"content-type" else value)
+                        for name, value in request.scope["headers"]
+                    ]
+                    request = MsgPackRequest(scope, request.receive)
+                return await original_route_handler(request)
+            finally:
+                response_format.reset(token)
+
+        return route_handler
@@ -1,12 +1,117 @@
+from typing import Literal, Optional
+
 from pydantic_settings import BaseSettings
 
 
 class Settings(BaseSettings):
     database_url: str
     secret_key: str
+
+    # Read replica (optional): GET requests read from it unless the user wrote
+    # recently or the replica lags too far behind the primary.
+    database_replica_url: str = ""
+    replica_max_lag_seconds: float = 5.0
+    replica_lag_check_seconds: float = 2.0
+    read_your_writes_seconds: float = 10.0
+
+    # Contact shards (optional): contacts live on one of these databases,
+    # picked per user. Empty keeps contacts on the primary.
+    contact_shard_urls: list[str] = []
+
+    # Account deletion: books up to the sync limit are deleted in the
+    # request, larger ones in chunks by a background task.
+    account_deletion_sync_limit: int = 1000
+    account_deletion_chunk_size: int = 1000
+
+    # Daily birthday digest job (scripts/birthday_digest.py): window, users
+    # per chunk, chunks in flight and SMTP connections open (each chunk's
+    # digests are spread over them, several emails per connection).
+    birthday_digest_days: int = 7
+    birthday_digest_chunk_size: int = 1000
+    birthday_digest_workers: int = 4
+    birthday_digest_email_concurrency: int = 20
+
+    # Country code for phone numbers entered in national format (0XX...)
+    default_phone_country_code: str = "380"
+
+    # Duplicate detection: books above the sync limit are scanned in the
+    # background. Match keys shared by more contacts than the block size
+    # are too common to tell anything and are skipped. Reports and pending
+    # scans are kept in Redis when REDIS_URL is set, so all workers share
+    # them; the cache size only bounds the in-process fallback.
+    duplicate_sync_limit: int = 5000
+    duplicate_cache_seconds: int = 600
+    duplicate_cache_size: int = 1024
+    duplicate_max_block_size: int = 50
+    duplicate_min_score: float = 0.5
+
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
     refresh_token_expire_days: int = 7
+    bcrypt_max_concurrency: int = 4
+    bcrypt_rounds: int = 14
+
+    # Use FastJSONResponse (orjson) as the app-wide default response class.
+    # Off by default: FastAPI already dumps response_model routes straight to
+    # JSON bytes with pydantic-core, which is faster for those routes.
+    fast_json_responses: bool = False
+
+    # Admission control: concurrency, queue size and queue wait per route class
+    admission_control_enabled: bool = True
+    admission_auth_concurrency: int = 4
+    admission_auth_queue: int = 32
+    admission_read_concurrency: int = 64
+    admission_read_queue: int = 256
+    admission_write_concurrency: int = 32
+    admission_write_queue: int = 128
+    admission_queue_timeout_ms: int = 2000
+    admission_retry_after_seconds: int = 1
+
+    # Response compression settings (zstd/br are used when installed)
+    compression_enabled: bool = True
+    compression_min_size: int = 1024
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 4
+    compression_zstd_level: int = 3
+    compression_cache_entries: int = 256
+
+    # SQL instrumentation settings
+    slow_query_threshold_ms: float = 200.0
+    sql_repeated_statement_threshold: int = 3
+    sql_debug_headers: bool = False
+
+    # Redis (optional)
+    redis_url: str = ""
+
+    # Production server (python -m app.server); 0 workers means one per CPU
+    server_host: str = "0.0.0.0"
+    server_port: int = 8000
+    server_workers: int = 0
+    server_backlog: int = 2048
+    server_keep_alive_seconds: int = 5
+    server_graceful_timeout_seconds: int = 30
+    server_max_requests: int = 0
+    server_max_requests_jitter: int = 0
+    server_limit_concurrency: Optional[int] = None
+    server_access_log: bool = False
+    server_forwarded_allow_ips: str = "127.0.0.1"
+    # Threads for sync routes and dependencies (anyio default: 40)
+    threadpool_size: int = 40
+    # Primary database connection pool per worker (SQLAlchemy defaults)
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+
+    # Startup warm-up: pre-opened pool connections and primed caches
+    warmup_enabled: bool = True
+    warmup_db_connections: int = 5
+
+    # Readiness probe settings
+    readiness_probe_timeout_seconds: float = 1.0
+    readiness_cache_seconds: float = 2.0
+    # Unready when this share of the request pool's connections is in use
+    readiness_max_pool_usage: float = 1.0
+    readiness_max_in_flight: int = 200
+    readiness_require_smtp: bool = False
 
     # Email settings
     mail_username: str = "noreply@example.com"
@@ -35,9 +140,20 @@ class Settings(BaseSettings):
     cloudinary_api_key: str = ""
     cloudinary_api_secret: str = ""
 
+    # Avatar processing settings
+    avatar_sizes: list[int] = [64, 128, 250]
+    avatar_format: Literal["WEBP", "JPEG"] = "WEBP"
+    avatar_quality: int = 82
+    avatar_max_upload_bytes: int = 5 * 1024 * 1024
+    image_process_workers: int = 2
+
+    # Avatar storage settings ("cloudinary" or "local")
+    avatar_storage_backend: str = "cloudinary"
+    local_storage_dir: str = "media/avatars"
+    local_storage_url_path: str = "/media/avatars"
+
     class Config:
         env_file = ".env"
 
 
 settings = Settings()
-
@@ -0,0 +1,157 @@
+import os
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+# With several uvicorn workers every process writes its samples into
+# PROMETHEUS_MULTIPROC_DIR and /metrics aggregates the whole directory.
+MULTIPROCESS_MODE = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+if MULTIPROCESS_MODE:
+    # Processes started without app.server (e.g. uvicorn --reload) do not
+    # get the directory prepared for them.
+    os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 50, 100)
+
+http_requests_total = Counter(
+    "http_requests_total",
+    "HTTP requests by route and status class",
+    ["method", "route", "status_class"],
+)
+http_request_duration_seconds = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+http_requests_in_flight = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being handled",
+    multiprocess_mode="livesum",
+)
+
+threadpool_busy_threads = Gauge(
+    "threadpool_busy_threads",
+    "Worker threads in use by sync endpoints and dependencies",
+    multiprocess_mode="livesum",
+)
+threadpool_size = Gauge(
+    "threadpool_size",
+    "Worker thread limit for sync endpoints and dependencies",
+    multiprocess_mode="livesum",
+)
+
+db_pool_size = Gauge(
+    "db_pool_size",
+    "Configured connection pool size",
+    multiprocess_mode="livesum",
+)
+db_pool_checked_out = Gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out of the pool",
+    multiprocess_mode="livesum",
+)
+db_pool_overflow = Gauge(
+    "db_pool_overflow",
+    "Overflow connections currently open beyond the pool size",
+    multiprocess_mode="livesum",
+)
+
+db_replica_lag_seconds = Gauge(
+    "db_replica_lag_seconds",
+    "Last measured replication lag of the read replica",
+    multiprocess_mode="max",
+)
+db_read_routing_total = Counter(
+    "db_read_routing_total",
+    "Read sessions handed out, by target database and reason",
+    ["target", "reason"],
+)
+
+db_queries_per_request = Histogram(
+    "db_queries_per_request",
+    "SQL statements issued per request",
+    ["route"],
+    buckets=QUERY_COUNT_BUCKETS,
+)
+db_time_per_request_seconds = Histogram(
+    "db_time_per_request_seconds",
+    "Time spent in SQL statements per request",
+    ["route"],
+    buckets=LATENCY_BUCKETS,
+)
+db_repeated_statement_requests_total = Counter(
+    "db_repeated_statement_requests_total",
+    "Requests that repeated an identical statement (possible N+1)",
+    ["route"],
+)
+
+sqlalchemy_compiled_cache_total = Counter(
+    "sqlalchemy_compiled_cache_total",
+    "Executed statements by SQLAlchemy compiled statement cache result",
+    ["result"],
+)
+
+admission_rejected_total = Counter(
+    "admission_rejected_total",
+    "Requests rejected with 503 by admission control",
+    ["route_class", "reason"],
+)
+admission_queue_seconds = Histogram(
+    "admission_queue_seconds",
+    "Time requests waited in the admission queue",
+    ["route_class"],
+    buckets=LATENCY_BUCKETS,
+)
+
+singleflight_coalesced_total = Counter(
+    "singleflight_coalesced_total",
+    "Calls that joined an identical in-flight call instead of running their own",
+    ["name"],
+)
+
+compression_cache_total = Counter(
+    "compression_cache_total",
+    "Compressed response bodies served from or added to the compression cache",
+    ["result"],
+)
+
+bcrypt_queue_seconds = Histogram(
+    "bcrypt_queue_seconds",
+    "Time spent waiting for a bcrypt slot",
+    buckets=LATENCY_BUCKETS,
+)
+bcrypt_duration_seconds = Histogram(
+    "bcrypt_duration_seconds",
+    "Time spent hashing or verifying a password",
+    buckets=LATENCY_BUCKETS,
+)
+
+email_queue_depth = Gauge(
+    "email_queue_depth",
+    "Emails scheduled as background tasks and not sent yet",
+    multiprocess_mode="livesum",
+)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    if MULTIPROCESS_MODE:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead() -> None:
+    if MULTIPROCESS_MODE:
+        multiprocess.mark_process_dead(os.getpid())
@@ -0,0 +1,22 @@
+import re
+
+from app.core.config import settings
+
+NON_DIGITS = re.compile(r"\D")
+
+
+def digits_only(value: str) -> str:
+    return NON_DIGITS.sub("", value)
+
+
+def normalize_phone(phone_number: str) -> str:
+    # E.164 digits without the "+". Numbers in national format (leading 0)
+    # get DEFAULT_PHONE_COUNTRY_CODE; "00" is the international prefix.
+    digits = digits_only(phone_number)
+    if phone_number.lstrip().startswith("+"):
+        return digits
+    if digits.startswith("00"):
+        return digits[2:]
+    if digits.startswith("0"):
+        return settings.default_phone_country_code + digits[1:]
+    return digits
@@ -0,0 +1,50 @@
+from contextvars import ContextVar
+from datetime import date
+from typing import Any
+
+import msgpack
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+MSGPACK_MEDIA_TYPES = (MSGPACK_MEDIA_TYPE, "application/x-msgpack")
+
+# Set per request by MsgPackRoute from the Accept header.
+response_format: ContextVar[str] = ContextVar("response_format", default="json")
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class FastJSONResponse(JSONResponse):
+    # orjson encodes date/datetime natively, so date_of_birth does not need a
+    # jsonable_encoder pass; falls back to the stdlib encoder without orjson.
+    def render(self, content: Any) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class NegotiatedResponse(FastJSONResponse):
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        # Caches must key the body on Accept as well; CompressionMiddleware
+        # appends Accept-Encoding to this header.
+        self.headers.add_vary_header("Accept")
+
+    def render(self, content: Any) -> bytes:
+        if response_format.get() == "msgpack":
+            self.media_type = MSGPACK_MEDIA_TYPE
+            return msgpack.packb(content, default=_default)
+        return super().render(content)
@@ -1,13 +1,18 @@
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from app.core import metrics
 from app.core.config import settings
-from app.db.database import get_db
+from app.db.replica import READ_METHODS, get_read_db, get_recent_writes
 from app.domain.user import User
 from app.schemas.user import TokenData
 import bcrypt
@@ -15,18 +20,39 @@ import bcrypt
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
+# bcrypt is CPU bound and releases the GIL; capping concurrent hashes keeps
+# them from competing for every core and makes the wait for a slot
+# measurable. Callers block while they wait, so this must only be reached
+# from sync routes (threadpool), never from the event loop, and a waiting
+# thread still holds its threadpool slot: keep BCRYPT_MAX_CONCURRENCY well
+# below THREADPOOL_SIZE.
+_bcrypt_slots = threading.BoundedSemaphore(settings.bcrypt_max_concurrency)
+
+
+@contextmanager
+def _bcrypt_slot():
+    queued_at = time.perf_counter()
+    with _bcrypt_slots:
+        started_at = time.perf_counter()
+        metrics.bcrypt_queue_seconds.observe(started_at - queued_at)
+        try:
+            yield
+        finally:
+            metrics.bcrypt_duration_seconds.observe(time.perf_counter() - started_at)
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     #return pwd_context.verify(plain_password, hashed_password)
     password = plain_password.encode("utf-8")
     hashed = hashed_password.encode("utf-8")
-    return bcrypt.checkpw(password, hashed)
+    with _bcrypt_slot():
+        return bcrypt.checkpw(password, hashed)
 
 
 def get_password_hash(password: str) -> str:
     #return pwd_context.hash(password)
-    hashed = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(14))
-    print("Hash generated:", hashed)
+    with _bcrypt_slot():
+        hashed = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(settings.bcrypt_rounds))
     return hashed.decode("utf-8")
 
 
@@ -83,6 +109,24 @@ def create_email_verification_token(email: str) -> str:
     return encoded_jwt
 
 
+def create_account_deletion_token(job_id: str) -> str:
+    to_encode = {"sub": job_id, "type": "account_deletion"}
+    expire = datetime.utcnow() + timedelta(days=7)
+    to_encode.update({"exp": expire})
+    encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
+    return encoded_jwt
+
+
+def verify_account_deletion_token(token: str, job_id: str) -> bool:
+    # The account is locked out (and later gone) while it is deleted, so
+    # progress is read with this token instead of the user's access token.
+    try:
+        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+    except JWTError:
+        return False
+    return payload.get("type") == "account_deletion" and payload.get("sub") == job_id
+
+
 def verify_email_token(token: str) -> str:
     try:
         payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
@@ -103,8 +147,9 @@ def verify_email_token(token: str) -> str:
 
 
 def get_current_user(
+    request: Request,
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ) -> User:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -121,8 +166,12 @@ def get_current_user(
     except JWTError:
         raise credentials_exception
 
-    user = db.query(User).filter(User.email == token_data.email).first()
-    if user is None:
+    user = db.scalars(select(User).where(User.email == email)).first()
+    if user is None or user.deletion_pending:
         raise credentials_exception
 
+    # Keeps this user's reads on the primary until the replica has caught up.
+    if request.method not in READ_METHODS:
+        get_recent_writes().mark(email)
+
     return user
@@ -0,0 +1,50 @@
+import threading
+from typing import Any, Callable, Hashable
+
+from app.core import metrics
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    # Concurrent calls with the same key share one execution of func: the
+    # first caller runs it, the others wait and receive the same result (or
+    # exception). Results are shared, so they must not be mutated by callers.
+    # Only calls in flight at the same time in this process are coalesced:
+    # nothing is cached once the leader returns.
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            metrics.singleflight_coalesced_total.labels(self.name).inc()
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
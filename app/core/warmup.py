@@ -0,0 +1,77 @@
+import time
+from datetime import date
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.db.database import SessionLocal, get_engine, get_replica_engine
+from app.repositories.contact_repository import ContactRepository
+from app.repositories.user_repository import UserRepository
+from app.schemas.contact import ContactCreate, ContactListResponse, ContactResponse
+from app.services.storage_service import get_storage_backend
+
+# user_id 0 never exists, so the priming queries touch no rows.
+NO_USER = 0
+
+
+def _open_pool_connections() -> None:
+    # Checking connections out together and returning them leaves them open
+    # in the pool, so the first requests skip connect and handshake.
+    for engine in filter(None, (get_engine(), get_replica_engine())):
+        size = engine.pool.size() if hasattr(engine.pool, "size") else 1
+        connections = [engine.connect() for _ in range(min(settings.warmup_db_connections, size))]
+        for connection in connections:
+            connection.close()
+
+
+def _prime_statement_cache() -> None:
+    # Indexed lookups only: list and birthday queries would scan contacts.
+    with SessionLocal() as db:
+        contacts = ContactRepository(db)
+        contacts.get_by_id(NO_USER, NO_USER)
+        contacts.exists_by_email("warmup@example.com", NO_USER)
+        users = UserRepository(db)
+        users.get_by_id(NO_USER)
+        users.get_by_email("warmup@example.com")
+
+
+def _prime_validators() -> None:
+    # First calls load email-validator, JWT and serializer code paths.
+    contact = ContactCreate(
+        first_name="Warm",
+        last_name="Up",
+        email="warmup@example.com",
+        phone_number="+380501234567",
+        date_of_birth=date(1990, 1, 1),
+    )
+    ContactListResponse(
+        contacts=[ContactResponse(id=NO_USER, **contact.model_dump())],
+        total=1,
+        page=1,
+        page_size=1,
+    ).model_dump_json()
+    create_access_token({"sub": "warmup@example.com"})
+
+
+WARMUP_STEPS = {
+    "pool": _open_pool_connections,
+    "statement_cache": _prime_statement_cache,
+    "validators": _prime_validators,
+    "storage_backend": get_storage_backend,
+}
+
+
+async def warm_up() -> dict[str, float]:
+    timings = {}
+    for name, step in WARMUP_STEPS.items():
+        started_at = time.perf_counter()
+        try:
+            await run_in_threadpool(step)
+        except Exception as e:
+            # A cold cache is not a reason to refuse traffic; the readiness
+            # probe reports unavailable dependencies.
+            print(f"Warm-up step {name} failed: {e}")
+        timings[name] = round((time.perf_counter() - started_at) * 1000, 2)
+    print(f"Warm-up finished in {sum(timings.values()):.0f} ms: {timings}")
+    return timings
@@ -1,9 +1,68 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import sqlite3
+from functools import lru_cache
+from typing import Optional
+
+from sqlalchemy import Engine, create_engine, event, make_url
+from sqlalchemy.orm import Session, sessionmaker
 from app.core.config import settings
+from app.db.instrumentation import install_query_instrumentation
+
+install_query_instrumentation()
+
+
+@event.listens_for(Engine, "connect")
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    # SQLite ignores ON DELETE CASCADE unless foreign keys are enabled on
+    # every connection.
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+
+# Engines are created on first use, not at import, and disposed on shutdown.
+@lru_cache
+def get_engine() -> Engine:
+    url = make_url(settings.database_url)
+    # In-memory SQLite uses a single-connection pool without these options.
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return create_engine(url)
+    return create_engine(url, pool_size=settings.db_pool_size, max_overflow=settings.db_max_overflow)
+
+
+@lru_cache
+def get_replica_engine() -> Optional[Engine]:
+    # Without a replica URL every read goes to the primary.
+    if not settings.database_replica_url:
+        return None
+    return create_engine(settings.database_replica_url)
+
 
-engine = create_engine(settings.database_url)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+@lru_cache
+def _session_factory() -> sessionmaker:
+    return sessionmaker(autocommit=False, autoflush=False, bind=get_engine())
+
+
+@lru_cache
+def _replica_session_factory() -> sessionmaker:
+    return sessionmaker(autocommit=False, autoflush=False, bind=get_replica_engine())
+
+
+def SessionLocal(**kwargs) -> Session:
+    return _session_factory()(**kwargs)
+
+
+def ReplicaSessionLocal(**kwargs) -> Session:
+    return _replica_session_factory()(**kwargs)
+
+
+def dispose_engines() -> None:
+    for factory in (get_engine, get_replica_engine):
+        if factory.cache_info().currsize and factory() is not None:
+            factory().dispose()
+        factory.cache_clear()
+    _session_factory.cache_clear()
+    _replica_session_factory.cache_clear()
 
 
 def get_db():
@@ -12,4 +71,3 @@ def get_db():
         yield db
     finally:
         db.close()
-
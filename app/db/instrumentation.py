@@ -0,0 +1,76 @@
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, default
+
+from app.core import metrics
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    total_time: float = 0.0
+    statements: Counter = field(default_factory=Counter)
+    cache_misses: int = 0
+
+    def repeated(self, threshold: int) -> dict[str, int]:
+        return {stmt: n for stmt, n in self.statements.items() if n >= threshold}
+
+
+CACHE_RESULTS = {
+    default.CACHE_HIT: "hit",
+    default.CACHE_MISS: "miss",
+    default.CACHING_DISABLED: "disabled",
+    default.NO_CACHE_KEY: "no_cache_key",
+    default.NO_DIALECT_SUPPORT: "no_dialect_support",
+}
+
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+
+
+def redact_parameters(parameters, executemany: bool):
+    if executemany:
+        return f"<{len(parameters)} parameter sets>"
+    if isinstance(parameters, dict):
+        return {key: "?" for key in parameters}
+    return ["?"] * len(parameters or ())
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+    cache_result = CACHE_RESULTS.get(getattr(context, "cache_hit", None), "unknown")
+    metrics.sqlalchemy_compiled_cache_total.labels(cache_result).inc()
+
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.total_time += elapsed
+        stats.statements[statement] += 1
+        stats.cache_misses += cache_result == "miss"
+
+    if elapsed * 1000 >= settings.slow_query_threshold_ms:
+        logger.warning(
+            "Slow query (%.1f ms): %s | params=%s",
+            elapsed * 1000,
+            statement,
+            redact_parameters(parameters, executemany),
+        )
+
+
+def install_query_instrumentation() -> None:
+    # Listening on the Engine class covers every engine the app creates.
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
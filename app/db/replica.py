@@ -0,0 +1,144 @@
+import threading
+import time
+from functools import lru_cache
+from typing import Optional
+
+import redis
+from fastapi import Depends, Request
+from jose import JWTError, jwt
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.singleflight import SingleFlight
+from app.db.database import ReplicaSessionLocal, get_db, get_replica_engine
+
+READ_METHODS = {"GET", "HEAD"}
+
+# pg_last_xact_replay_timestamp() keeps ageing on an idle primary, so lag is
+# only counted while the replica still has WAL left to replay.
+POSTGRES_LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+
+class RecentWriteTracker:
+    def __init__(self, window_seconds: float):
+        self.window_seconds = window_seconds
+        self._writes: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def mark(self, subject: str) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._writes[subject] = now + self.window_seconds
+            if len(self._writes) > 10_000:
+                self._writes = {s: until for s, until in self._writes.items() if until > now}
+
+    def wrote_recently(self, subject: str) -> bool:
+        until = self._writes.get(subject)
+        return until is not None and until > time.monotonic()
+
+
+class RedisRecentWriteTracker(RecentWriteTracker):
+    # Shared between workers, so a write handled by one process is seen by
+    # the process that serves the next read.
+    def __init__(self, window_seconds: float, url: str):
+        super().__init__(window_seconds)
+        self._redis = redis.Redis.from_url(url, socket_timeout=0.2)
+
+    def mark(self, subject: str) -> None:
+        try:
+            self._redis.set(f"recent_write:{subject}", 1, px=int(self.window_seconds * 1000))
+        except redis.RedisError as e:
+            print(f"Error marking recent write: {e}")
+            super().mark(subject)
+
+    def wrote_recently(self, subject: str) -> bool:
+        try:
+            return bool(self._redis.exists(f"recent_write:{subject}"))
+        except redis.RedisError:
+            return True
+
+
+class ReplicaLagMonitor:
+    def __init__(self):
+        self._lag = 0.0
+        self._checked_at = float("-inf")
+        self._refreshes = SingleFlight("replica_lag_refresh")
+
+    def _measure(self) -> float:
+        replica_engine = get_replica_engine()
+        if replica_engine.dialect.name != "postgresql":
+            return 0.0
+        with replica_engine.connect() as connection:
+            return float(connection.execute(POSTGRES_LAG_QUERY).scalar() or 0.0)
+
+    def _refresh(self) -> float:
+        try:
+            self._lag = self._measure()
+        except Exception as e:
+            print(f"Error checking replica lag: {e}")
+            self._lag = float("inf")
+        self._checked_at = time.monotonic()
+        metrics.db_replica_lag_seconds.set(self._lag)
+        return self._lag
+
+    def lag(self) -> float:
+        if time.monotonic() - self._checked_at < settings.replica_lag_check_seconds:
+            return self._lag
+        # Every read arriving once the value expired would otherwise query
+        # the replica; they share one measurement instead.
+        return self._refreshes.do("lag", self._refresh)
+
+
+@lru_cache
+def get_recent_writes() -> RecentWriteTracker:
+    if settings.redis_url:
+        return RedisRecentWriteTracker(settings.read_your_writes_seconds, settings.redis_url)
+    return RecentWriteTracker(settings.read_your_writes_seconds)
+
+
+replica_lag = ReplicaLagMonitor()
+
+
+def token_subject(request: Request) -> Optional[str]:
+    # Only used to pick a database; the token is verified by get_current_user.
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        return jwt.get_unverified_claims(token).get("sub")
+    except JWTError:
+        return None
+
+
+def _read_target(request: Request) -> tuple[str, str]:
+    if get_replica_engine() is None:
+        return "primary", "no_replica"
+    if request.method not in READ_METHODS:
+        return "primary", "write_request"
+    subject = token_subject(request)
+    if subject and get_recent_writes().wrote_recently(subject):
+        return "primary", "recent_write"
+    if replica_lag.lag() > settings.replica_max_lag_seconds:
+        return "primary", "replica_lag"
+    return "replica", "ok"
+
+
+def get_read_db(request: Request, db: Session = Depends(get_db)):
+    target, reason = _read_target(request)
+    metrics.db_read_routing_total.labels(target, reason).inc()
+    if target == "primary":
+        # Shared reads may have started before this user's write.
+        db.info["coalesce_reads"] = reason != "recent_write"
+        yield db
+        return
+
+    replica = ReplicaSessionLocal()
+    try:
+        yield replica
+    finally:
+        replica.close()
@@ -0,0 +1,112 @@
+from contextlib import contextmanager
+from functools import cached_property
+from typing import Iterator, Optional
+
+from sqlalchemy import Column, Engine, Identity, Index, MetaData, Table, create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.domain.contact import Contact
+from app.domain.user import User
+
+# Each shard generates contact ids from its own residue class, so ids stay
+# unique across shards and a user's contacts can be moved without
+# renumbering (on dialects with identity columns, i.e. not SQLite).
+SHARD_ID_STRIDE = 64
+
+
+def shard_contacts_table(metadata: MetaData, shard: int, id_start: int = 1) -> Table:
+    # Same columns as contacts, minus the foreign key: users stay on the
+    # primary database.
+    columns = []
+    for column in Contact.__table__.columns:
+        if column.primary_key:
+            columns.append(Column(
+                column.name,
+                column.type,
+                Identity(start=id_start + shard, increment=SHARD_ID_STRIDE),
+                primary_key=True,
+            ))
+        else:
+            columns.append(Column(
+                column.name,
+                column.type,
+                nullable=column.nullable,
+                index=bool(column.index) or column.name == "user_id",
+                default=column.default.arg if column.default is not None else None,
+            ))
+    table = Table(Contact.__table__.name, metadata, *columns)
+    # Multi-column indexes from __table_args__; single-column ones come with
+    # the columns above.
+    for index in Contact.__table__.indexes:
+        if len(index.columns) > 1:
+            Index(index.name, *[table.c[column.name] for column in index.columns], **index.kwargs)
+    return table
+
+
+class ShardRouter:
+    # Engines are created on first use; urls default to CONTACT_SHARD_URLS.
+    def __init__(self, urls: Optional[list[str]] = None):
+        self._urls = urls
+
+    @property
+    def urls(self) -> list[str]:
+        return self._urls if self._urls is not None else settings.contact_shard_urls
+
+    @cached_property
+    def engines(self) -> list[Engine]:
+        return [create_engine(url) for url in self.urls]
+
+    @cached_property
+    def _sessions(self) -> list[sessionmaker]:
+        return [
+            sessionmaker(autocommit=False, autoflush=False, bind=engine)
+            for engine in self.engines
+        ]
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.urls)
+
+    def __len__(self) -> int:
+        return len(self.urls)
+
+    def default_shard(self, user_id: int) -> int:
+        return user_id % len(self)
+
+    def shard_for(self, user: User) -> Optional[int]:
+        # None for users from before sharding (never pinned): their contacts
+        # stay on the primary until moved.
+        return user.contact_shard
+
+    def session(self, shard: int) -> Session:
+        return self._sessions[shard]()
+
+    @contextmanager
+    def contact_session(self, user: User, primary: Session) -> Iterator[Session]:
+        shard = self.shard_for(user) if self.enabled else None
+        if shard is None:
+            yield primary
+            return
+        session = self.session(shard)
+        session.info.update(primary.info)
+        try:
+            yield session
+        finally:
+            session.close()
+
+    def create_schema(self, id_start: int = 1) -> None:
+        for shard, engine in enumerate(self.engines):
+            metadata = MetaData()
+            shard_contacts_table(metadata, shard, id_start)
+            metadata.create_all(engine)
+
+    def dispose(self) -> None:
+        if "engines" in self.__dict__:
+            for engine in self.engines:
+                engine.dispose()
+            del self.__dict__["engines"]
+            self.__dict__.pop("_sessions", None)
+
+
+shard_router = ShardRouter()
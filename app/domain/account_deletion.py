@@ -0,0 +1,29 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import String, Integer, DateTime, Text, func
+from sqlalchemy import Enum as SQLAlchemyEnum
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.domain.base import MinimalBase
+from app.domain.enums import AccountDeletionStatus
+
+
+class AccountDeletion(MinimalBase):
+    __tablename__ = "account_deletions"
+
+    # Random ids: the job outlives the account, so progress is looked up
+    # without authentication.
+    id: Mapped[str] = mapped_column(String(32), primary_key=True, default=lambda: uuid.uuid4().hex)
+    # No foreign key, the user row is deleted before the job finishes.
+    user_id: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+    status: Mapped[AccountDeletionStatus] = mapped_column(
+        SQLAlchemyEnum(AccountDeletionStatus),
+        nullable=False,
+        default=AccountDeletionStatus.PENDING,
+    )
+    total_contacts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    deleted_contacts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    error = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, server_default=func.now())
+    finished_at = mapped_column(DateTime, nullable=True)
@@ -1,10 +1,31 @@
-from sqlalchemy import Column, String, Date, Text, Integer, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Date, Text, Integer, ForeignKey, Index
+from sqlalchemy.orm import relationship, validates
+from app.core.phone import normalize_phone
 from app.domain.base import BaseModel
 
 
+def _phone_digits_default(context) -> str:
+    return normalize_phone(context.get_current_parameters()["phone_number"])
+
+
+def _phone_digits_reversed_default(context) -> str:
+    return _phone_digits_default(context)[::-1]
+
+
 class Contact(BaseModel):
     __tablename__ = "contacts"
+    __table_args__ = (
+        # varchar_pattern_ops lets PostgreSQL use the indexes for LIKE 'digits%'
+        # whatever the database collation.
+        Index(
+            "ix_contacts_user_id_phone_digits", "user_id", "phone_digits",
+            postgresql_ops={"phone_digits": "varchar_pattern_ops"},
+        ),
+        Index(
+            "ix_contacts_user_id_phone_digits_reversed", "user_id", "phone_digits_reversed",
+            postgresql_ops={"phone_digits_reversed": "varchar_pattern_ops"},
+        ),
+    )
 
     first_name = Column(String(50), nullable=False, index=True)
     last_name = Column(String(50), nullable=False, index=True)
@@ -12,6 +33,17 @@ class Contact(BaseModel):
     phone_number = Column(String(20), nullable=False)
     date_of_birth = Column(Date, nullable=False)
     additional_data = Column(Text, nullable=True)
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    # phone_number as E.164 digits, and reversed so that "ends with" lookups
+    # are prefix matches. Kept in sync with phone_number: by the validator
+    # for ORM writes, by the column defaults for Core inserts.
+    phone_digits = Column(String(20), nullable=False, default=_phone_digits_default)
+    phone_digits_reversed = Column(String(20), nullable=False, default=_phone_digits_reversed_default)
 
     user = relationship("User", back_populates="contacts")
+
+    @validates("phone_number")
+    def _sync_phone_digits(self, key, phone_number):
+        self.phone_digits = normalize_phone(phone_number)
+        self.phone_digits_reversed = self.phone_digits[::-1]
+        return phone_number
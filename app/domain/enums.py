@@ -10,4 +10,11 @@ class AutoName(Enum):
 class UserRoles(AutoName):
     ADMIN = auto()
     MANAGER = auto()
-    EMPLOYEE = auto()
\ No newline at end of file
+    EMPLOYEE = auto()
+
+
+class AccountDeletionStatus(AutoName):
+    PENDING = auto()
+    RUNNING = auto()
+    COMPLETED = auto()
+    FAILED = auto()
@@ -1,4 +1,4 @@
-from sqlalchemy import String, Boolean
+from sqlalchemy import String, Boolean, JSON, Integer
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy import Enum as SQLAlchemyEnum
 from sqlalchemy.sql import expression
@@ -26,6 +26,18 @@ class User(BaseModel):
         server_default=expression.text("false"),  # DB-side default
     )
     avatar = mapped_column(String(255), nullable=True)
+    avatar_urls = mapped_column(JSON, nullable=True)
     refresh_token = mapped_column(String(500), nullable=True)
+    # Shard holding this user's contacts; NULL means user_id % shard count.
+    contact_shard = mapped_column(Integer, nullable=True)
+    # Set while the account is being deleted; such users cannot log in.
+    deletion_pending = mapped_column(
+        Boolean,
+        nullable=False,
+        default=False,
+        server_default=expression.text("false"),
+    )
 
-    contacts = relationship("Contact", back_populates="user", cascade="all, delete-orphan")
+    # passive_deletes leaves contact removal to ON DELETE CASCADE instead of
+    # loading every contact to delete it row by row.
+    contacts = relationship("Contact", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
@@ -0,0 +1,105 @@
+import asyncio
+import time
+from typing import Optional
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core import metrics
+from app.core.config import settings
+
+# bcrypt-heavy endpoints get their own small budget so a login storm cannot
+# starve cheap contact reads, and vice versa.
+AUTH_PATHS = {"/auth/login", "/auth/register"}
+EXEMPT_PREFIXES = ("/health", "/metrics", "/docs", "/redoc", "/openapi.json")
+READ_METHODS = {"GET", "HEAD"}
+
+
+def classify(scope: Scope) -> Optional[str]:
+    path = scope["path"]
+    if path.startswith(EXEMPT_PREFIXES) or path.startswith(settings.local_storage_url_path):
+        return None
+    if path in AUTH_PATHS:
+        return "auth"
+    if scope["method"] in READ_METHODS:
+        return "read"
+    return "write"
+
+
+class Budget:
+    def __init__(self, name: str, concurrency: int, queue_size: int, queue_timeout: float):
+        self.name = name
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.waiting = 0
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    async def acquire(self) -> Optional[str]:
+        if not self._semaphore.locked():
+            await self._semaphore.acquire()
+            return None
+        if self.waiting >= self.queue_size:
+            return "queue_full"
+
+        self.waiting += 1
+        queued_at = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+            return None
+        except asyncio.TimeoutError:
+            return "queue_timeout"
+        finally:
+            self.waiting -= 1
+            metrics.admission_queue_seconds.labels(self.name).observe(time.perf_counter() - queued_at)
+
+    def release(self) -> None:
+        self._semaphore.release()
+
+
+class AdmissionControlMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        queue_timeout = settings.admission_queue_timeout_ms / 1000
+        self.budgets = {
+            "auth": Budget("auth", settings.admission_auth_concurrency, settings.admission_auth_queue, queue_timeout),
+            "read": Budget("read", settings.admission_read_concurrency, settings.admission_read_queue, queue_timeout),
+            "write": Budget("write", settings.admission_write_concurrency, settings.admission_write_queue, queue_timeout),
+        }
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        route_class = classify(scope) if scope["type"] == "http" and settings.admission_control_enabled else None
+        if route_class is None:
+            await self.app(scope, receive, send)
+            return
+
+        budget = self.budgets[route_class]
+        rejection = await budget.acquire()
+        if rejection is not None:
+            metrics.admission_rejected_total.labels(route_class, rejection).inc()
+            response = JSONResponse(
+                status_code=503,
+                content={"detail": "Server is overloaded, please retry later"},
+                headers={"Retry-After": str(settings.admission_retry_after_seconds)},
+            )
+            await response(scope, receive, send)
+            return
+
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            if not released:
+                released = True
+                budget.release()
+
+        async def send_wrapper(message: Message) -> None:
+            await send(message)
+            # Background tasks (e.g. emails) run after the response is sent
+            # and should not keep holding the slot.
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                release()
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            release()
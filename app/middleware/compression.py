@@ -0,0 +1,134 @@
+import gzip
+import hashlib
+from collections import OrderedDict
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core import metrics
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+COMPRESSIBLE_CONTENT_TYPES = ("application/json", "application/msgpack", "text/", "application/xml")
+
+
+def available_encodings() -> list[str]:
+    encodings = []
+    if zstandard is not None:
+        encodings.append("zstd")
+    if brotli is not None:
+        encodings.append("br")
+    encodings.append("gzip")
+    return encodings
+
+
+def negotiate_encoding(accept_encoding: str, supported: list[str]) -> Optional[str]:
+    accepted = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+    for encoding in supported:
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+def compress(encoding: str, body: bytes) -> bytes:
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=settings.compression_zstd_level).compress(body)
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.compression_brotli_quality)
+    return gzip.compress(body, compresslevel=settings.compression_gzip_level, mtime=0)
+
+
+class CompressedBodyCache:
+    # Identical bodies (the same page polled repeatedly, shared birthday
+    # lists, ...) are compressed once; later hits only pay for the digest.
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, bytes], bytes] = OrderedDict()
+
+    def get_or_compress(self, encoding: str, body: bytes) -> bytes:
+        key = (encoding, hashlib.blake2b(body, digest_size=16).digest())
+        compressed = self._entries.get(key)
+        if compressed is not None:
+            self._entries.move_to_end(key)
+            metrics.compression_cache_total.labels("hit").inc()
+            return compressed
+
+        metrics.compression_cache_total.labels("miss").inc()
+        compressed = compress(encoding, body)
+        if self.max_entries > 0:
+            self._entries[key] = compressed
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return compressed
+
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.encodings = available_encodings()
+        self.cache = CompressedBodyCache(settings.compression_cache_entries)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.compression_enabled:
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""), self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            headers = MutableHeaders(raw=start_message["headers"])
+            body = message.get("body", b"")
+            # Streaming responses and small or already encoded bodies go out
+            # untouched.
+            if (
+                message.get("more_body", False)
+                or len(body) < settings.compression_min_size
+                or "content-encoding" in headers
+                or not headers.get("content-type", "").startswith(COMPRESSIBLE_CONTENT_TYPES)
+            ):
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            compressed = self.cache.get_or_compress(encoding, body)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            await send(start_message)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
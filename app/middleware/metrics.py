@@ -0,0 +1,64 @@
+import time
+
+import anyio.to_thread
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core import metrics
+from app.db.database import get_engine
+
+EXCLUDED_PATHS = {"/metrics"}
+
+_in_flight = 0
+
+
+def get_in_flight() -> int:
+    return _in_flight
+
+
+def sample_runtime_gauges() -> None:
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    metrics.threadpool_busy_threads.set(limiter.borrowed_tokens)
+    metrics.threadpool_size.set(limiter.total_tokens)
+
+    pool = get_engine().pool
+    if hasattr(pool, "checkedout"):
+        metrics.db_pool_size.set(pool.size())
+        metrics.db_pool_checked_out.set(pool.checkedout())
+        metrics.db_pool_overflow.set(max(pool.overflow(), 0))
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        global _in_flight
+        if scope["type"] != "http" or scope["path"] in EXCLUDED_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        _in_flight += 1
+        metrics.http_requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _in_flight -= 1
+            metrics.http_requests_in_flight.dec()
+            route = scope.get("route")
+            route_path = route.path if route else "unmatched"
+            metrics.http_requests_total.labels(
+                scope["method"], route_path, f"{status_code // 100}xx"
+            ).inc()
+            metrics.http_request_duration_seconds.labels(scope["method"], route_path).observe(
+                time.perf_counter() - start
+            )
+            sample_runtime_gauges()
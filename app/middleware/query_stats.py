@@ -0,0 +1,52 @@
+import logging
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core import metrics
+from app.core.config import settings
+from app.db.instrumentation import QueryStats, current_query_stats
+
+logger = logging.getLogger(__name__)
+
+
+def route_name(scope: Scope) -> str:
+    route = scope.get("route")
+    return f"{scope['method']} {route.path if route else 'unmatched'}"
+
+
+class QueryStatsMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and settings.sql_debug_headers:
+                headers = MutableHeaders(scope=message)
+                headers["X-DB-Query-Count"] = str(stats.count)
+                headers["X-DB-Time-Ms"] = f"{stats.total_time * 1000:.2f}"
+                headers["X-DB-Cache-Misses"] = str(stats.cache_misses)
+                headers["X-DB-Repeated-Statements"] = str(
+                    len(stats.repeated(settings.sql_repeated_statement_threshold))
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_query_stats.reset(token)
+            route = route_name(scope)
+            repeated = stats.repeated(settings.sql_repeated_statement_threshold)
+            for statement, count in repeated.items():
+                logger.warning("Statement repeated %d times in %s (possible N+1): %s", count, route, statement)
+            metrics.db_queries_per_request.labels(route).observe(stats.count)
+            metrics.db_time_per_request_seconds.labels(route).observe(stats.total_time)
+            if repeated:
+                metrics.db_repeated_statement_requests_total.labels(route).inc()
@@ -0,0 +1,33 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.domain.account_deletion import AccountDeletion
+from app.domain.enums import AccountDeletionStatus
+
+
+class AccountDeletionRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def create(self, user_id: int, total_contacts: int) -> AccountDeletion:
+        job = AccountDeletion(user_id=user_id, total_contacts=total_contacts)
+        self.db.add(job)
+        self.db.commit()
+        self.db.refresh(job)
+        return job
+
+    def get_by_id(self, job_id: str) -> Optional[AccountDeletion]:
+        return self.db.get(AccountDeletion, job_id)
+
+    def set_status(self, job: AccountDeletion, status: AccountDeletionStatus, error: Optional[str] = None) -> None:
+        job.status = status
+        job.error = error
+        if status in (AccountDeletionStatus.COMPLETED, AccountDeletionStatus.FAILED):
+            job.finished_at = datetime.utcnow()
+        self.db.commit()
+
+    def add_progress(self, job: AccountDeletion, deleted: int) -> None:
+        job.deleted_contacts += deleted
+        self.db.commit()
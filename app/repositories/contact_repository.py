@@ -1,72 +1,167 @@
-from typing import Optional, List
+import re
+from typing import Optional, List, Iterable, Sequence
 from datetime import date, timedelta
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy import Row, delete, extract, or_, select, func, true
 
+from app.core.phone import digits_only, normalize_phone
 from app.domain.contact import Contact
-from app.schemas.contact import ContactCreate, ContactUpdate
+from app.schemas.contact import ContactCreate, ContactUpdate, CONTACT_FIELDS
+
+contacts_table = Contact.__table__
+
+# Search queries with at least this many digits (and nothing but digits and
+# phone punctuation) also match phone numbers.
+MIN_PHONE_SEARCH_DIGITS = 3
+PHONE_QUERY = re.compile(r"^\+?[\d\s\-()]+$")
+
+
+def birthday_window(column, start: date, days: int):
+    # Month and day as one number (March 7 -> 307), so the window is a range
+    # the database can check, or two ranges when it wraps over New Year.
+    if days >= 365:
+        return true()
+    end = start + timedelta(days=days)
+    first, last = start.month * 100 + start.day, end.month * 100 + end.day
+    month_day = extract("month", column) * 100 + extract("day", column)
+    if first <= last:
+        return month_day.between(first, last)
+    return or_(month_day >= first, month_day <= last)
 
 
 class ContactRepository:
     def __init__(self, db: Session):
         self.db = db
 
-    def create(self, contact_data: ContactCreate, user_id: int) -> Contact:
+    def _save(self, contact: Contact, commit: bool) -> None:
+        if commit:
+            self.db.commit()
+            self.db.refresh(contact)
+        else:
+            self.db.flush()
+
+    def create(self, contact_data: ContactCreate, user_id: int, commit: bool = True) -> Contact:
         contact = Contact(**contact_data.model_dump(), user_id=user_id)
         self.db.add(contact)
-        self.db.commit()
-        self.db.refresh(contact)
+        self._save(contact, commit)
         return contact
 
-    def get_by_id(self, contact_id: int, user_id: int) -> Optional[Contact]:
-        return self.db.query(Contact).filter(
+    def get_by_id(self, contact_id: int, user_id: int, fields: Optional[Iterable[str]] = None) -> Optional[Contact]:
+        stmt = select(Contact).where(
             Contact.id == contact_id,
             Contact.user_id == user_id
-        ).first()
+        )
+        if fields is not None:
+            stmt = stmt.options(load_only(*[getattr(Contact, name) for name in fields]))
+        return self.db.scalars(stmt).first()
 
     def get_by_email(self, email: str, user_id: int) -> Optional[Contact]:
-        return self.db.query(Contact).filter(
+        stmt = select(Contact).where(
             Contact.email == email,
             Contact.user_id == user_id
-        ).first()
-
-    def get_all(self, user_id: int, skip: int = 0, limit: int = 100) -> tuple[List[Contact], int]:
-        query = self.db.query(Contact).filter(Contact.user_id == user_id)
-        total = query.count()
-        contacts = query.offset(skip).limit(limit).all()
-        return contacts, total
-
-    def search(self, query: str, user_id: int, skip: int = 0, limit: int = 100) -> tuple[List[Contact], int]:
-        search_filter = or_(
-            Contact.first_name.ilike(f"%{query}%"),
-            Contact.last_name.ilike(f"%{query}%"),
-            Contact.email.ilike(f"%{query}%")
-        )
-        db_query = self.db.query(Contact).filter(
-            search_filter,
-            Contact.user_id == user_id
-        )
-        total = db_query.count()
-        contacts = db_query.offset(skip).limit(limit).all()
-        return contacts, total
-
-    def get_upcoming_birthdays(self, user_id: int, days: int = 7) -> List[Contact]:
-        today = date.today()
-        end_date = today + timedelta(days=days)
-        contacts = self.db.query(Contact).filter(Contact.user_id == user_id).all()
-
-        upcoming = []
-        for contact in contacts:
-            birthday_this_year = contact.date_of_birth.replace(year=today.year)
-            if birthday_this_year < today:
-                birthday_this_year = contact.date_of_birth.replace(year=today.year + 1)
-
-            if today <= birthday_this_year <= end_date:
-                upcoming.append(contact)
-
-        return upcoming
-
-    def update(self, contact_id: int, user_id: int, contact_data: ContactUpdate) -> Optional[Contact]:
+        ).limit(1)
+        return self.db.scalars(stmt).first()
+
+    @staticmethod
+    def _read_columns(fields: Optional[Iterable[str]]) -> list:
+        return [contacts_table.c[name] for name in sorted(fields or CONTACT_FIELDS)]
+
+    def _read_page(self, where: list, skip: int, limit: int, fields: Optional[Iterable[str]]) -> tuple[Sequence[Row], int]:
+        # Read-only list endpoints select plain rows through Core: nothing is
+        # added to the session identity map and the response schemas read the
+        # row attributes directly.
+        total = self.db.execute(
+            select(func.count()).select_from(contacts_table).where(*where)
+        ).scalar_one()
+        rows = self.db.execute(
+            select(*self._read_columns(fields))
+            .where(*where)
+            .order_by(contacts_table.c.id)
+            .offset(skip)
+            .limit(limit)
+        ).all()
+        return rows, total
+
+    def get_all(
+        self,
+        user_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        fields: Optional[Iterable[str]] = None
+    ) -> tuple[Sequence[Row], int]:
+        return self._read_page([contacts_table.c.user_id == user_id], skip, limit, fields)
+
+    def search(
+        self,
+        query: str,
+        user_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        fields: Optional[Iterable[str]] = None
+    ) -> tuple[Sequence[Row], int]:
+        conditions = [
+            contacts_table.c.first_name.ilike(f"%{query}%"),
+            contacts_table.c.last_name.ilike(f"%{query}%"),
+            contacts_table.c.email.ilike(f"%{query}%")
+        ]
+        digits = digits_only(query)
+        if PHONE_QUERY.match(query) and len(digits) >= MIN_PHONE_SEARCH_DIGITS:
+            # Numbers starting with the query (as typed, normalized) or
+            # ending with its digits.
+            conditions += [
+                contacts_table.c.phone_digits.like(f"{normalize_phone(query)}%"),
+                contacts_table.c.phone_digits_reversed.like(f"{digits[::-1]}%")
+            ]
+        search_filter = or_(*conditions)
+        return self._read_page([search_filter, contacts_table.c.user_id == user_id], skip, limit, fields)
+
+    def get_upcoming_birthdays(self, user_id: int, days: int = 7) -> List[Row]:
+        return self.db.execute(
+            select(*self._read_columns(None))
+            .where(
+                contacts_table.c.user_id == user_id,
+                birthday_window(contacts_table.c.date_of_birth, date.today(), days)
+            )
+            .order_by(contacts_table.c.id)
+        ).all()
+
+    def get_upcoming_birthdays_for_users(self, user_ids: Sequence[int], start: date, days: int) -> List[Row]:
+        return self.db.execute(
+            select(contacts_table.c.user_id, *self._read_columns(None))
+            .where(
+                contacts_table.c.user_id.in_(user_ids),
+                birthday_window(contacts_table.c.date_of_birth, start, days)
+            )
+            .order_by(contacts_table.c.user_id, contacts_table.c.id)
+        ).all()
+
+    def get_by_phone(self, user_id: int, phone_number: str, suffix: bool = False) -> List[Row]:
+        # An equality match on the normalized digits, or for a suffix a
+        # prefix match on the reversed digits; both columns are indexed.
+        if suffix:
+            phone_filter = contacts_table.c.phone_digits_reversed.like(f"{digits_only(phone_number)[::-1]}%")
+        else:
+            phone_filter = contacts_table.c.phone_digits == normalize_phone(phone_number)
+        return self.db.execute(
+            select(*self._read_columns(None))
+            .where(contacts_table.c.user_id == user_id, phone_filter)
+            .order_by(contacts_table.c.id)
+        ).all()
+
+    def get_all_rows(self, user_id: int) -> List[Row]:
+        return self.db.execute(
+            select(*self._read_columns(None))
+            .where(contacts_table.c.user_id == user_id)
+            .order_by(contacts_table.c.id)
+        ).all()
+
+    def update(
+        self,
+        contact_id: int,
+        user_id: int,
+        contact_data: ContactUpdate,
+        commit: bool = True
+    ) -> Optional[Contact]:
         contact = self.get_by_id(contact_id, user_id)
         if not contact:
             return None
@@ -75,24 +170,41 @@ class ContactRepository:
         for field, value in update_data.items():
             setattr(contact, field, value)
 
-        self.db.commit()
-        self.db.refresh(contact)
+        self._save(contact, commit)
         return contact
 
-    def delete(self, contact_id: int, user_id: int) -> bool:
+    def delete(self, contact_id: int, user_id: int, commit: bool = True) -> bool:
         contact = self.get_by_id(contact_id, user_id)
         if not contact:
             return False
         self.db.delete(contact)
-        self.db.commit()
+        if commit:
+            self.db.commit()
+        else:
+            self.db.flush()
         return True
 
     def exists_by_email(self, email: str, user_id: int, exclude_id: Optional[int] = None) -> bool:
-        query = self.db.query(Contact).filter(
+        stmt = select(Contact.id).where(
             Contact.email == email,
             Contact.user_id == user_id
         )
         if exclude_id:
-            query = query.filter(Contact.id != exclude_id)
-        return query.first() is not None
-
+            stmt = stmt.where(Contact.id != exclude_id)
+        return self.db.scalar(stmt.limit(1)) is not None
+
+    def count_by_user(self, user_id: int) -> int:
+        return self.db.execute(
+            select(func.count()).select_from(contacts_table).where(contacts_table.c.user_id == user_id)
+        ).scalar_one()
+
+    def delete_chunk(self, user_id: int, size: int) -> int:
+        # Two statements instead of DELETE ... LIMIT, which not every
+        # database supports.
+        ids = self.db.scalars(
+            select(contacts_table.c.id).where(contacts_table.c.user_id == user_id).limit(size)
+        ).all()
+        if ids:
+            self.db.execute(delete(contacts_table).where(contacts_table.c.id.in_(ids)))
+            self.db.commit()
+        return len(ids)
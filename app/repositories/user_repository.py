@@ -1,9 +1,11 @@
 from typing import Optional
+from sqlalchemy import delete, select
 from sqlalchemy.orm import Session
 
 from app.domain.user import User
 from app.schemas.user import UserCreate
 from app.core.security import get_password_hash
+from app.db.sharding import shard_router
 
 
 class UserRepository:
@@ -19,18 +21,23 @@ class UserRepository:
             hashed_password=hashed_password
         )
         self.db.add(user)
+        self.db.flush()
+        if shard_router.enabled:
+            # Pinned at creation so adding shards later does not remap
+            # existing users.
+            user.contact_shard = shard_router.default_shard(user.id)
         self.db.commit()
         self.db.refresh(user)
         return user
 
     def get_by_id(self, user_id: int) -> Optional[User]:
-        return self.db.query(User).filter(User.id == user_id).first()
+        return self.db.get(User, user_id)
 
     def get_by_email(self, email: str) -> Optional[User]:
-        return self.db.query(User).filter(User.email == email).first()
+        return self.db.scalars(select(User).where(User.email == email)).first()
 
     def exists_by_email(self, email: str) -> bool:
-        return self.db.query(User).filter(User.email == email).first() is not None
+        return self.db.scalar(select(User.id).where(User.email == email).limit(1)) is not None
 
     def update_refresh_token(self, user_id: int, refresh_token: str) -> User:
         user = self.get_by_id(user_id)
@@ -60,10 +67,22 @@ class UserRepository:
             self.db.refresh(user)
         return user
 
-    def update_avatar(self, user_id: int, avatar_url: str) -> Optional[User]:
+    def update_avatar(self, user_id: int, avatar: str, avatar_urls: dict[str, str]) -> Optional[User]:
         user = self.get_by_id(user_id)
         if user:
-            user.avatar = avatar_url
+            user.avatar = avatar
+            user.avatar_urls = avatar_urls
             self.db.commit()
             self.db.refresh(user)
         return user
+
+    def begin_deletion(self, user: User) -> None:
+        user.deletion_pending = True
+        user.refresh_token = None
+        self.db.flush()
+
+    def delete(self, user_id: int) -> None:
+        # A bulk DELETE, so contacts still on this database are removed by
+        # ON DELETE CASCADE rather than loaded by the ORM.
+        self.db.execute(delete(User).where(User.id == user_id))
+        self.db.commit()
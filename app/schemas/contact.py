@@ -1,6 +1,7 @@
-from pydantic import BaseModel, EmailStr, Field, field_validator
-from datetime import date
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, create_model, field_validator
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, Literal, Optional
 import re
 
 
@@ -88,12 +89,37 @@ class ContactUpdate(BaseModel):
         return v.title()
 
 
-class ContactResponse(ContactBase):
+class ContactResponse(BaseModel):
+    # Read model for rows coming from our own database: no input validators,
+    # so serializing a page does not re-run them for every contact.
     id: int
+    first_name: str
+    last_name: str
+    email: str
+    phone_number: str
+    date_of_birth: date
+    additional_data: Optional[str] = None
 
     model_config = {"from_attributes": True}
 
 
+class DuplicateGroup(BaseModel):
+    # keep_id: suggested contact to merge the others into (the oldest)
+    keep_id: int
+    score: float
+    # Matching signals, strongest first: phone (same normalized E.164
+    # digits), email, email_local, name, name_sound, birthday
+    reasons: list[str]
+    contacts: list[ContactResponse]
+
+
+class DuplicateReport(BaseModel):
+    status: Literal["ready", "pending"]
+    computed_at: Optional[datetime] = None
+    total_groups: int = 0
+    groups: list[DuplicateGroup] = []
+
+
 class ContactListResponse(BaseModel):
     contacts: list[ContactResponse]
     total: int
@@ -101,3 +127,54 @@ class ContactListResponse(BaseModel):
     page_size: int
 
 
+MAX_BATCH_OPERATIONS = 100
+
+
+class ContactBatchOperation(BaseModel):
+    op: Literal["create", "update", "delete"]
+    id: Optional[int] = None
+    data: Optional[dict[str, Any]] = None
+
+
+class ContactBatchRequest(BaseModel):
+    operations: list[ContactBatchOperation] = Field(..., min_length=1, max_length=MAX_BATCH_OPERATIONS)
+    # atomic: all operations commit together or none do.
+    # Otherwise each operation commits or fails on its own.
+    atomic: bool = True
+
+
+class ContactBatchResult(BaseModel):
+    index: int
+    op: str
+    status: int
+    contact: Optional[ContactResponse] = None
+    error: Optional[Any] = None
+
+
+class ContactBatchResponse(BaseModel):
+    committed: bool
+    results: list[ContactBatchResult]
+
+
+CONTACT_FIELDS = frozenset(ContactResponse.model_fields)
+
+
+@lru_cache(maxsize=64)
+def contact_projection(fields: frozenset[str]) -> tuple[type[BaseModel], type[BaseModel]]:
+    item_model = create_model(
+        "ContactProjection",
+        __config__=ConfigDict(from_attributes=True),
+        **{
+            name: (field.annotation, field)
+            for name, field in ContactResponse.model_fields.items()
+            if name in fields
+        },
+    )
+    list_model = create_model(
+        "ContactListProjection",
+        contacts=(list[item_model], ...),
+        total=(int, ...),
+        page=(int, ...),
+        page_size=(int, ...),
+    )
+    return item_model, list_model
@@ -1,6 +1,9 @@
+from datetime import datetime
 from pydantic import BaseModel, EmailStr, Field
 from typing import Optional
 
+from app.domain.enums import AccountDeletionStatus
+
 
 class UserBase(BaseModel):
     email: EmailStr
@@ -17,6 +20,7 @@ class UserResponse(UserBase):
     first_name: Optional[str] = None
     last_name: Optional[str] = None
     avatar: Optional[str] = None
+    avatar_urls: Optional[dict[str, str]] = None
     is_confirmed: bool
 
     model_config = {"from_attributes": True}
@@ -35,3 +39,17 @@ class RefreshTokenRequest(BaseModel):
 class TokenData(BaseModel):
     email: Optional[str] = None
 
+
+class AccountDeletionResponse(BaseModel):
+    id: str
+    status: AccountDeletionStatus
+    total_contacts: int
+    deleted_contacts: int
+    error: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+    # Only in the DELETE /auth/me response: bearer token for
+    # GET /auth/deletions/{id}.
+    status_token: Optional[str] = None
+
+    model_config = {"from_attributes": True}
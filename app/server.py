@@ -0,0 +1,60 @@
+import glob
+import importlib.util
+import os
+import tempfile
+
+import uvicorn
+
+from app.core.config import settings
+
+
+def worker_count() -> int:
+    if settings.server_workers > 0:
+        return settings.server_workers
+    # CPUs this process may run on, which respects container CPU sets.
+    return len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+
+
+def prepare_metrics_dir(workers: int) -> None:
+    # Workers are separate processes, so Prometheus needs its multiprocess
+    # directory; files left by a previous run would be counted again.
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if path is None:
+        if workers == 1:
+            return
+        path = os.path.join(tempfile.gettempdir(), "prometheus-multiproc")
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = path
+    os.makedirs(path, exist_ok=True)
+    for stale in glob.glob(os.path.join(path, "*.db")):
+        os.remove(stale)
+
+
+def main() -> None:
+    workers = worker_count()
+    prepare_metrics_dir(workers)
+
+    uvicorn.run(
+        "main:app",
+        host=settings.server_host,
+        port=settings.server_port,
+        workers=workers,
+        loop="uvloop" if importlib.util.find_spec("uvloop") else "asyncio",
+        http="httptools" if importlib.util.find_spec("httptools") else "h11",
+        backlog=settings.server_backlog,
+        timeout_keep_alive=settings.server_keep_alive_seconds,
+        # SIGTERM stops accepting connections and lets in-flight requests
+        # finish for up to this long before the lifespan shutdown runs.
+        timeout_graceful_shutdown=settings.server_graceful_timeout_seconds,
+        # Recycles each worker after about this many requests (0 = never);
+        # the jitter (default 10%) keeps workers from restarting together.
+        limit_max_requests=settings.server_max_requests or None,
+        limit_max_requests_jitter=settings.server_max_requests_jitter or settings.server_max_requests // 10,
+        limit_concurrency=settings.server_limit_concurrency,
+        access_log=settings.server_access_log,
+        proxy_headers=True,
+        forwarded_allow_ips=settings.server_forwarded_allow_ips,
+    )
+
+
+if __name__ == "__main__":
+    main()
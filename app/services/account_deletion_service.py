@@ -0,0 +1,78 @@
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.db.sharding import shard_router
+from app.domain.account_deletion import AccountDeletion
+from app.domain.enums import AccountDeletionStatus
+from app.domain.user import User
+from app.repositories.account_deletion_repository import AccountDeletionRepository
+from app.repositories.contact_repository import ContactRepository
+from app.repositories.user_repository import UserRepository
+from app.services.avatar_service import avatar_service
+
+
+class AccountDeletionService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.users = UserRepository(db)
+        self.jobs = AccountDeletionRepository(db)
+
+    def start_deletion(self, user: User) -> AccountDeletion:
+        with shard_router.contact_session(user, self.db) as contact_db:
+            total = ContactRepository(contact_db).count_by_user(user.id)
+        # Revokes the refresh token and locks the account out before any
+        # data is removed.
+        self.users.begin_deletion(user)
+        return self.jobs.create(user.id, total)
+
+    def get_deletion(self, job_id: str) -> Optional[AccountDeletion]:
+        return self.jobs.get_by_id(job_id)
+
+    @staticmethod
+    def is_small(job: AccountDeletion) -> bool:
+        return job.total_contacts <= settings.account_deletion_sync_limit
+
+
+def run_account_deletion(job_id: str) -> None:
+    # Runs with its own sessions so it can be scheduled as a background task
+    # after the request session is closed. Re-running a failed job resumes it.
+    # Progress is committed per chunk, so objects are not expired on commit.
+    with SessionLocal(expire_on_commit=False) as db:
+        jobs = AccountDeletionRepository(db)
+        users = UserRepository(db)
+        job = jobs.get_by_id(job_id)
+        user = users.get_by_id(job.user_id)
+        if user is None:
+            jobs.set_status(job, AccountDeletionStatus.COMPLETED)
+            return
+
+        jobs.set_status(job, AccountDeletionStatus.RUNNING)
+        try:
+            with shard_router.contact_session(user, db) as contact_db:
+                # Contacts on the primary that fit in one chunk go with the
+                # user row through ON DELETE CASCADE; shards have no foreign
+                # key and huge books are deleted in chunks to keep each
+                # transaction short.
+                if contact_db is not db or job.total_contacts > settings.account_deletion_chunk_size:
+                    contacts = ContactRepository(contact_db)
+                    while deleted := contacts.delete_chunk(user.id, settings.account_deletion_chunk_size):
+                        jobs.add_progress(job, deleted)
+
+            avatar_urls = user.avatar_urls
+            users.delete(user.id)
+            job.deleted_contacts = job.total_contacts
+            jobs.set_status(job, AccountDeletionStatus.COMPLETED)
+        except Exception as e:
+            print(f"Error deleting account {job.user_id}: {e}")
+            db.rollback()
+            jobs.set_status(job, AccountDeletionStatus.FAILED, str(e))
+            return
+
+    # Only once the account is gone: a failed job keeps the avatar with it.
+    try:
+        avatar_service.delete_avatar(job.user_id, avatar_urls)
+    except Exception as e:
+        print(f"Error deleting avatar of user {job.user_id}: {e}")
@@ -0,0 +1,68 @@
+import asyncio
+from typing import Optional
+
+from fastapi import UploadFile, HTTPException
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.services.image_service import AVATAR_FORMATS, process_avatar, ImageProcessingError
+from app.services.storage_service import get_storage_backend
+
+
+class AvatarService:
+
+    @staticmethod
+    async def upload_avatar(file: UploadFile, user_id: int) -> dict[str, str]:
+        if not file.content_type or not file.content_type.startswith('image/'):
+            raise HTTPException(
+                status_code=400,
+                detail="File must be an image (jpeg, png, gif, etc.)"
+            )
+
+        contents = await file.read()
+        if len(contents) > settings.avatar_max_upload_bytes:
+            raise HTTPException(
+                status_code=400,
+                detail=f"File size must be less than {settings.avatar_max_upload_bytes // (1024 * 1024)}MB"
+            )
+
+        try:
+            variants = await process_avatar(contents)
+        except ImageProcessingError as e:
+            raise HTTPException(
+                status_code=400,
+                detail=str(e)
+            )
+
+        backend = get_storage_backend()
+        content_type, _ = AVATAR_FORMATS[settings.avatar_format]
+        try:
+            urls = await asyncio.gather(*[
+                run_in_threadpool(backend.save, data, f"user_{user_id}_{size}", content_type)
+                for size, data in variants.items()
+            ])
+            return {str(size): url for size, url in zip(variants, urls)}
+
+        except Exception as e:
+            print(f"Error storing avatar: {e}")
+            raise HTTPException(
+                status_code=500,
+                detail=f"Failed to upload image: {str(e)}"
+            )
+
+    @staticmethod
+    def delete_avatar(user_id: int, avatar_urls: Optional[dict]) -> None:
+        backend = get_storage_backend()
+        for size in avatar_urls or {}:
+            backend.delete(f"user_{user_id}_{size}")
+
+    @staticmethod
+    def get_avatar_variant_url(avatar_urls: Optional[dict], size: int, default: Optional[str] = None) -> Optional[str]:
+        if not avatar_urls:
+            return default
+        available = sorted(int(s) for s in avatar_urls)
+        best = next((s for s in available if s >= size), available[-1])
+        return avatar_urls[str(best)]
+
+
+avatar_service = AvatarService()
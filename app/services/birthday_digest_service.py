@@ -0,0 +1,209 @@
+import asyncio
+import json
+import os
+import time
+from bisect import bisect_right
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Optional
+
+from fastapi_mail import MessageSchema
+from sqlalchemy import Row, select
+
+from app.db.database import SessionLocal
+from app.db.sharding import shard_router
+from app.domain.user import User
+from app.repositories.contact_repository import ContactRepository
+from app.services.email_service import birthday_digest_message, send_birthday_digests
+
+users_table = User.__table__
+
+
+def upcoming_birthday(date_of_birth: date, start: date) -> date:
+    for year in (start.year, start.year + 1):
+        try:
+            day = date_of_birth.replace(year=year)
+        except ValueError:
+            # February 29 outside leap years
+            day = date(year, 3, 1)
+        if day >= start:
+            return day
+    raise ValueError(f"No birthday after {start} for {date_of_birth}")
+
+
+class DigestCheckpoint:
+    # A header line naming the run, then the first and last user id of every
+    # finished chunk. A file left by a different run is started over; a line
+    # cut short by a crash is ignored, so that chunk runs again.
+    def __init__(self, path: str, run: dict):
+        self.path = Path(path)
+        header = json.dumps(run, sort_keys=True)
+        ranges = []
+        if self.path.exists():
+            *lines, _ = self.path.read_text().split("\n")
+            if lines and lines[0] == header:
+                ranges = sorted(tuple(map(int, line.split())) for line in lines[1:])
+        if not ranges:
+            self.path.write_text(header + "\n")
+        # Merged, so covers() can bisect: chunks of a resumed run may span
+        # ranges finished before.
+        self.done: list[tuple[int, int]] = []
+        for first_id, last_id in ranges:
+            if self.done and first_id <= self.done[-1][1]:
+                self.done[-1] = (self.done[-1][0], max(self.done[-1][1], last_id))
+            else:
+                self.done.append((first_id, last_id))
+        self._firsts = [first_id for first_id, _ in self.done]
+        self._file = self.path.open("a")
+
+    def covers(self, user_id: int) -> bool:
+        i = bisect_right(self._firsts, user_id) - 1
+        return i >= 0 and user_id <= self.done[i][1]
+
+    def mark(self, first_id: int, last_id: int) -> None:
+        self._file.write(f"{first_id} {last_id}\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        self._file.close()
+
+
+@dataclass
+class DigestStats:
+    chunks: int = 0
+    # users skipped as finished by an earlier run
+    resumed_users: int = 0
+    # True if the deadline stopped the run before the last chunk
+    unfinished: bool = False
+    users: int = 0
+    digests: int = 0
+    failed: int = 0
+
+
+class BirthdayDigestJob:
+    def __init__(
+        self,
+        start: date,
+        days: int,
+        chunk_size: int,
+        workers: int,
+        email_concurrency: int,
+        checkpoint: Optional[DigestCheckpoint] = None,
+        dry_run: bool = False,
+        deadline: Optional[float] = None
+    ):
+        self.start = start
+        self.days = days
+        self.chunk_size = chunk_size
+        self.workers = workers
+        self.email_concurrency = email_concurrency
+        self.checkpoint = checkpoint
+        self.dry_run = dry_run
+        # time.monotonic() after which no new chunk is started
+        self.deadline = deadline
+        self.stats = DigestStats()
+
+    def load_users(self, after_id: int) -> list[Row]:
+        # Keyset page: gaps in the ids cost nothing.
+        with SessionLocal() as db:
+            return db.execute(
+                select(users_table.c.id, users_table.c.email, users_table.c.first_name, users_table.c.contact_shard)
+                .where(
+                    users_table.c.id > after_id,
+                    users_table.c.is_confirmed.is_(True),
+                    users_table.c.deletion_pending.is_(False)
+                )
+                .order_by(users_table.c.id)
+                .limit(self.chunk_size)
+            ).all()
+
+    def load_birthdays(self, users: list[Row]) -> list[tuple[Row, list[Row]]]:
+        # One set-based birthday query per database holding the users'
+        # contacts.
+        by_shard = defaultdict(list)
+        for user in users:
+            by_shard[shard_router.shard_for(user) if shard_router.enabled else None].append(user.id)
+
+        contacts = defaultdict(list)
+        for shard, user_ids in by_shard.items():
+            session = SessionLocal() if shard is None else shard_router.session(shard)
+            try:
+                for row in ContactRepository(session).get_upcoming_birthdays_for_users(
+                    user_ids, self.start, self.days
+                ):
+                    contacts[row.user_id].append(row)
+            finally:
+                session.close()
+
+        return [(user, contacts[user.id]) for user in users if user.id in contacts]
+
+    def _message(self, user: Row, contacts: list[Row]) -> MessageSchema:
+        birthdays = []
+        for contact in contacts:
+            day = upcoming_birthday(contact.date_of_birth, self.start)
+            birthdays.append((f"{contact.first_name} {contact.last_name}", day, day.year - contact.date_of_birth.year))
+        birthdays.sort(key=lambda birthday: birthday[1])
+        return birthday_digest_message(user.email, user.first_name or user.email, birthdays)
+
+    async def _send(self, messages: list[MessageSchema]) -> bool:
+        async with self._connections:
+            return await send_birthday_digests(messages)
+
+    async def _run_chunk(self, first_id: int, last_id: int, users: list[Row]) -> None:
+        try:
+            digests = await asyncio.to_thread(self.load_birthdays, users)
+            messages = [self._message(user, contacts) for user, contacts in digests]
+            if self.dry_run:
+                self.stats.digests += len(messages)
+            else:
+                # Split over up to email_concurrency connections; the
+                # semaphore bounds them across all chunks in flight.
+                parts = [messages[i::self.email_concurrency] for i in range(self.email_concurrency)]
+                parts = [part for part in parts if part]
+                for part, sent in zip(parts, await asyncio.gather(*(self._send(part) for part in parts))):
+                    if sent:
+                        self.stats.digests += len(part)
+                    else:
+                        self.stats.failed += len(part)
+            self.stats.chunks += 1
+            self.stats.users += len(users)
+            # Only after every email of the chunk went out: a crash before
+            # this line sends the chunk again on resume.
+            if self.checkpoint is not None:
+                self.checkpoint.mark(first_id, last_id)
+            if self.stats.chunks % 100 == 0:
+                print(f"  {self.stats.chunks} chunks, {self.stats.users} users, {self.stats.digests} digests")
+        finally:
+            self._chunks.release()
+
+    async def run(self) -> DigestStats:
+        self._chunks = asyncio.Semaphore(self.workers)
+        self._connections = asyncio.Semaphore(self.email_concurrency)
+
+        tasks = []
+        after_id = 0
+        while True:
+            # The next page is read once a worker is free, so at most
+            # `workers` chunks are held in memory.
+            await self._chunks.acquire()
+            page = await asyncio.to_thread(self.load_users, after_id)
+            if not page:
+                self._chunks.release()
+                break
+            if self.deadline is not None and time.monotonic() > self.deadline:
+                self._chunks.release()
+                self.stats.unfinished = True
+                break
+            first_id, after_id = page[0].id, page[-1].id
+            users = [user for user in page if self.checkpoint is None or not self.checkpoint.covers(user.id)]
+            self.stats.resumed_users += len(page) - len(users)
+            if not users:
+                self._chunks.release()
+                continue
+            tasks.append(asyncio.create_task(self._run_chunk(first_id, after_id, users)))
+
+        await asyncio.gather(*tasks)
+        return self.stats
@@ -1,11 +1,27 @@
-from typing import Optional, List
+from typing import Any, Callable, Optional, List, Iterable, Sequence
+from pydantic import ValidationError
+from sqlalchemy import Row
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from app.core.phone import digits_only
+from app.core.singleflight import SingleFlight
 from app.repositories.contact_repository import ContactRepository
-from app.schemas.contact import ContactCreate, ContactUpdate
+from app.schemas.contact import (
+    ContactCreate,
+    ContactUpdate,
+    ContactResponse,
+    ContactBatchOperation,
+    ContactBatchResult,
+    ContactBatchResponse
+)
 from app.domain.contact import Contact
 
 
+MIN_PHONE_DIGITS = 7
+MIN_PHONE_SUFFIX_DIGITS = 4
+
+
 class ContactAlreadyExistsError(Exception):
     pass
 
@@ -14,19 +30,43 @@ class ContactNotFoundError(Exception):
     pass
 
 
+class InvalidBatchOperationError(Exception):
+    pass
+
+
+# Identical concurrent list reads (several devices, double-fired requests)
+# share one query. Only the row-based read paths go through it: Rows are
+# immutable, ORM instances are bound to the leader's session. Reads are keyed
+# by the engine they run on, so a read routed to the primary never joins a
+# replica query, and reads of users who just wrote are not shared at all.
+_reads = SingleFlight("contact_reads")
+
+
+def _fields_key(fields: Optional[Iterable[str]]) -> Optional[tuple[str, ...]]:
+    # Hashable and order-independent, so any iterable of the same fields
+    # joins the same call; also consumed once if fields is a generator.
+    return None if fields is None else tuple(sorted(set(fields)))
+
+
 class ContactService:
     def __init__(self, db: Session):
+        self.db = db
         self.repository = ContactRepository(db)
 
-    def create_contact(self, contact_data: ContactCreate, user_id: int) -> Contact:
+    def _shared_read(self, key: tuple, func: Callable[[], Any]) -> Any:
+        if not self.db.info.get("coalesce_reads", True):
+            return func()
+        return _reads.do((self.db.get_bind(), *key), func)
+
+    def create_contact(self, contact_data: ContactCreate, user_id: int, commit: bool = True) -> Contact:
         if self.repository.exists_by_email(contact_data.email, user_id):
             raise ContactAlreadyExistsError(
                 f"Contact with email {contact_data.email} already exists"
             )
-        return self.repository.create(contact_data, user_id)
+        return self.repository.create(contact_data, user_id, commit)
 
-    def get_contact(self, contact_id: int, user_id: int) -> Contact:
-        contact = self.repository.get_by_id(contact_id, user_id)
+    def get_contact(self, contact_id: int, user_id: int, fields: Optional[Iterable[str]] = None) -> Contact:
+        contact = self.repository.get_by_id(contact_id, user_id, fields)
         if not contact:
             raise ContactNotFoundError(f"Contact with ID {contact_id} not found")
         return contact
@@ -38,31 +78,57 @@ class ContactService:
         self,
         user_id: int,
         skip: int = 0,
-        limit: int = 100
-    ) -> tuple[List[Contact], int]:
-        return self.repository.get_all(user_id, skip, limit)
+        limit: int = 100,
+        fields: Optional[Iterable[str]] = None
+    ) -> tuple[Sequence[Row], int]:
+        fields = _fields_key(fields)
+        return self._shared_read(
+            ("all", user_id, skip, limit, fields),
+            lambda: self.repository.get_all(user_id, skip, limit, fields)
+        )
 
     def search_contacts(
         self,
         query: str,
         user_id: int,
         skip: int = 0,
-        limit: int = 100
-    ) -> tuple[List[Contact], int]:
+        limit: int = 100,
+        fields: Optional[Iterable[str]] = None
+    ) -> tuple[Sequence[Row], int]:
         if not query or not query.strip():
-            return self.get_all_contacts(user_id, skip, limit)
-        return self.repository.search(query.strip(), user_id, skip, limit)
-
-    def get_upcoming_birthdays(self, user_id: int, days: int = 7) -> List[Contact]:
+            return self.get_all_contacts(user_id, skip, limit, fields)
+        query = query.strip()
+        fields = _fields_key(fields)
+        return self._shared_read(
+            ("search", user_id, query, skip, limit, fields),
+            lambda: self.repository.search(query, user_id, skip, limit, fields)
+        )
+
+    def get_upcoming_birthdays(self, user_id: int, days: int = 7) -> List[Row]:
         if days < 1 or days > 365:
             raise ValueError("Days must be between 1 and 365")
-        return self.repository.get_upcoming_birthdays(user_id, days)
+        return self._shared_read(
+            ("birthdays", user_id, days),
+            lambda: self.repository.get_upcoming_birthdays(user_id, days)
+        )
+
+    def find_by_phone(self, user_id: int, phone_number: str, suffix: bool = False) -> List[Row]:
+        digits = digits_only(phone_number)
+        if suffix and len(digits) < MIN_PHONE_SUFFIX_DIGITS:
+            raise ValueError(f"Phone suffix must contain at least {MIN_PHONE_SUFFIX_DIGITS} digits")
+        if not suffix and len(digits) < MIN_PHONE_DIGITS:
+            raise ValueError(f"Phone number must contain at least {MIN_PHONE_DIGITS} digits")
+        return self._shared_read(
+            ("phone", user_id, phone_number, suffix),
+            lambda: self.repository.get_by_phone(user_id, phone_number, suffix)
+        )
 
     def update_contact(
         self,
         contact_id: int,
         user_id: int,
-        contact_data: ContactUpdate
+        contact_data: ContactUpdate,
+        commit: bool = True
     ) -> Contact:
         existing_contact = self.repository.get_by_id(contact_id, user_id)
         if not existing_contact:
@@ -74,14 +140,111 @@ class ContactService:
                     f"Contact with email {contact_data.email} already exists"
                 )
 
-        updated_contact = self.repository.update(contact_id, user_id, contact_data)
+        updated_contact = self.repository.update(contact_id, user_id, contact_data, commit)
         if not updated_contact:
             raise ContactNotFoundError(f"Contact with ID {contact_id} not found")
         return updated_contact
 
-    def delete_contact(self, contact_id: int, user_id: int) -> bool:
-        success = self.repository.delete(contact_id, user_id)
+    def delete_contact(self, contact_id: int, user_id: int, commit: bool = True) -> bool:
+        success = self.repository.delete(contact_id, user_id, commit)
         if not success:
             raise ContactNotFoundError(f"Contact with ID {contact_id} not found")
         return True
 
+    def _apply_batch_operation(self, operation: ContactBatchOperation, user_id: int) -> Optional[Contact]:
+        if operation.op != "create" and operation.id is None:
+            raise InvalidBatchOperationError(f"'{operation.op}' requires an id")
+        if operation.op != "delete" and operation.data is None:
+            raise InvalidBatchOperationError(f"'{operation.op}' requires data")
+
+        if operation.op == "create":
+            return self.create_contact(ContactCreate.model_validate(operation.data), user_id, commit=False)
+        if operation.op == "update":
+            return self.update_contact(
+                operation.id, user_id, ContactUpdate.model_validate(operation.data), commit=False
+            )
+        self.delete_contact(operation.id, user_id, commit=False)
+        return None
+
+    def execute_batch(
+        self,
+        operations: List[ContactBatchOperation],
+        user_id: int,
+        atomic: bool = True
+    ) -> ContactBatchResponse:
+        results = []
+        failed = False
+
+        for index, operation in enumerate(operations):
+            if failed and atomic:
+                results.append(ContactBatchResult(
+                    index=index, op=operation.op, status=424,
+                    error="Not executed: an earlier operation failed"
+                ))
+                continue
+
+            savepoint = None if atomic else self.db.begin_nested()
+            try:
+                contact = self._apply_batch_operation(operation, user_id)
+                # Constraint errors surface here, charged to this operation.
+                if savepoint is not None:
+                    savepoint.commit()
+                else:
+                    self.db.flush()
+            except (
+                ValidationError,
+                InvalidBatchOperationError,
+                ContactNotFoundError,
+                ContactAlreadyExistsError,
+                IntegrityError
+            ) as e:
+                if savepoint is not None:
+                    savepoint.rollback()
+                failed = True
+                results.append(ContactBatchResult(index=index, op=operation.op, **self._batch_error(e)))
+                continue
+
+            # Serialized before the final commit expires the instances.
+            results.append(ContactBatchResult(
+                index=index,
+                op=operation.op,
+                status=204 if contact is None else 201 if operation.op == "create" else 200,
+                contact=None if contact is None else ContactResponse.model_validate(contact),
+            ))
+
+        if failed and atomic:
+            self.db.rollback()
+            return ContactBatchResponse(committed=False, results=self._rolled_back(
+                results, 424, "Rolled back: another operation failed"
+            ))
+
+        try:
+            self.db.commit()
+        except IntegrityError:
+            self.db.rollback()
+            return ContactBatchResponse(committed=False, results=self._rolled_back(
+                results, 409, "Rolled back: the batch conflicted with existing data on commit"
+            ))
+        return ContactBatchResponse(committed=True, results=results)
+
+    @staticmethod
+    def _rolled_back(results: List[ContactBatchResult], status: int, error: str) -> List[ContactBatchResult]:
+        # Operations that succeeded before the whole batch was rolled back.
+        return [
+            ContactBatchResult(index=result.index, op=result.op, status=status, error=error)
+            if result.status < 400 else result
+            for result in results
+        ]
+
+    @staticmethod
+    def _batch_error(error: Exception) -> dict:
+        if isinstance(error, ValidationError):
+            return {"status": 422, "error": error.errors(include_url=False, include_context=False)}
+        if isinstance(error, ContactNotFoundError):
+            return {"status": 404, "error": str(error)}
+        if isinstance(error, ContactAlreadyExistsError):
+            return {"status": 409, "error": str(error)}
+        if isinstance(error, IntegrityError):
+            return {"status": 409, "error": "Conflicts with existing data"}
+        return {"status": 400, "error": str(error)}
+
@@ -0,0 +1,286 @@
+import threading
+import time
+import unicodedata
+from collections import OrderedDict, defaultdict
+from datetime import datetime, timezone
+from functools import lru_cache
+from itertools import combinations
+from typing import Optional, Sequence
+
+import redis
+from sqlalchemy import Row
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.phone import normalize_phone
+from app.core.singleflight import SingleFlight
+from app.db.database import SessionLocal
+from app.db.sharding import shard_router
+from app.repositories.contact_repository import ContactRepository
+from app.repositories.user_repository import UserRepository
+from app.schemas.contact import DuplicateGroup, DuplicateReport
+
+SOUNDEX_CODES = {
+    letter: digit
+    for digit, letters in (("1", "BFPV"), ("2", "CGJKQSXZ"), ("3", "DT"), ("4", "L"), ("5", "MN"), ("6", "R"))
+    for letter in letters
+}
+
+# Score of each matching signal; a pair's score is their sum, capped at 1.
+# Only the strongest of email / email_local and name / name_sound counts.
+MATCH_WEIGHTS = {
+    "phone": 0.5,
+    "email": 0.5,
+    "email_local": 0.35,
+    "name": 0.3,
+    "name_sound": 0.2,
+    "birthday": 0.2,
+}
+
+# Shorter phones are not compared: extensions and placeholders.
+MIN_PHONE_KEY_DIGITS = 7
+
+
+# Names repeat a lot within and across books.
+@lru_cache(maxsize=16384)
+def soundex(name: str) -> str:
+    letters = [c for c in unicodedata.normalize("NFKD", name).upper() if "A" <= c <= "Z"]
+    if not letters:
+        return ""
+    code, previous = letters[0], SOUNDEX_CODES.get(letters[0], "")
+    for letter in letters[1:]:
+        digit = SOUNDEX_CODES.get(letter, "")
+        if digit and digit != previous:
+            code += digit
+            if len(code) == 4:
+                break
+        # H and W do not separate letters with the same code.
+        if letter not in "HW":
+            previous = digit
+    return code.ljust(4, "0")
+
+
+def phone_key(phone_number: str) -> Optional[str]:
+    # The same normalization as the stored phone_digits, so "+380501234567"
+    # and "0501234567" match but numbers from different countries do not.
+    digits = normalize_phone(phone_number)
+    return digits if len(digits) >= MIN_PHONE_KEY_DIGITS else None
+
+
+def email_local_key(email: str) -> str:
+    local = email.lower().partition("@")[0]
+    return local.partition("+")[0].replace(".", "")
+
+
+# Keys contacts are grouped by before any pair is compared.
+BLOCKING_KEYS = ("phone", "email_local", "name_sound")
+
+
+def match_keys(contact: Row) -> dict:
+    return {
+        "phone": phone_key(contact.phone_number),
+        "email": contact.email.lower(),
+        "email_local": email_local_key(contact.email),
+        "name": (contact.first_name.casefold(), contact.last_name.casefold()),
+        "name_sound": soundex(contact.first_name) + soundex(contact.last_name),
+        "birthday": contact.date_of_birth,
+    }
+
+
+def score_pair(a: dict, b: dict) -> tuple[float, list[str]]:
+    reasons = []
+    if a["phone"] and a["phone"] == b["phone"]:
+        reasons.append("phone")
+    if a["email"] == b["email"]:
+        reasons.append("email")
+    elif a["email_local"] == b["email_local"]:
+        reasons.append("email_local")
+    if a["name"] == b["name"]:
+        reasons.append("name")
+    elif a["name_sound"] == b["name_sound"]:
+        reasons.append("name_sound")
+    if a["birthday"] == b["birthday"]:
+        reasons.append("birthday")
+    return min(1.0, sum(MATCH_WEIGHTS[reason] for reason in reasons)), reasons
+
+
+def find_duplicate_groups(contacts: Sequence[Row], min_score: float, max_block_size: int) -> list[DuplicateGroup]:
+    # Blocking: only contacts sharing a match key are compared, instead of
+    # every pair in the book.
+    keys = [match_keys(contact) for contact in contacts]
+    blocks = defaultdict(list)
+    for i, contact_keys in enumerate(keys):
+        for name in BLOCKING_KEYS:
+            if contact_keys[name]:
+                blocks[name, contact_keys[name]].append(i)
+
+    pairs = {}
+    for members in blocks.values():
+        if 1 < len(members) <= max_block_size:
+            for i, j in combinations(members, 2):
+                if (i, j) not in pairs:
+                    pairs[i, j] = score_pair(keys[i], keys[j])
+
+    # Matching pairs are merged into groups (union-find).
+    parent = list(range(len(contacts)))
+
+    def root(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    matches = [(i, j, score, reasons) for (i, j), (score, reasons) in pairs.items() if score >= min_score]
+    for i, j, _, _ in matches:
+        parent[root(i)] = root(j)
+
+    members, scores, reasons_by_group = defaultdict(set), defaultdict(float), defaultdict(set)
+    for i, j, score, reasons in matches:
+        group = root(i)
+        members[group].update((i, j))
+        scores[group] = max(scores[group], score)
+        reasons_by_group[group].update(reasons)
+
+    groups = []
+    for group, indexes in members.items():
+        group_contacts = sorted((contacts[i] for i in indexes), key=lambda contact: contact.id)
+        groups.append(DuplicateGroup(
+            keep_id=group_contacts[0].id,
+            score=round(scores[group], 2),
+            reasons=sorted(reasons_by_group[group], key=list(MATCH_WEIGHTS).index),
+            contacts=group_contacts,
+        ))
+    groups.sort(key=lambda group: (-group.score, -len(group.contacts), group.keep_id))
+    return groups
+
+
+class DuplicateFinder:
+    # Reports are cached per user for DUPLICATE_CACHE_SECONDS in this
+    # process (see RedisDuplicateFinder for several workers); large books are scanned by a background task while callers
+    # get a pending report.
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reports: OrderedDict[int, tuple[float, DuplicateReport]] = OrderedDict()
+        self._pending: set[int] = set()
+        self._scans = SingleFlight("duplicate_scans")
+
+    def cached(self, user_id: int) -> Optional[DuplicateReport]:
+        with self._lock:
+            entry = self._reports.get(user_id)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._reports[user_id]
+                return None
+            self._reports.move_to_end(user_id)
+            return entry[1]
+
+    def _store(self, user_id: int, report: DuplicateReport) -> None:
+        with self._lock:
+            self._reports[user_id] = (time.monotonic() + settings.duplicate_cache_seconds, report)
+            self._reports.move_to_end(user_id)
+            while len(self._reports) > settings.duplicate_cache_size:
+                self._reports.popitem(last=False)
+
+    def scan(self, user_id: int, db: Session) -> DuplicateReport:
+        # Concurrent scans of the same book share one run.
+        def run() -> DuplicateReport:
+            groups = find_duplicate_groups(
+                ContactRepository(db).get_all_rows(user_id),
+                settings.duplicate_min_score,
+                settings.duplicate_max_block_size,
+            )
+            report = DuplicateReport(
+                status="ready",
+                computed_at=datetime.now(timezone.utc),
+                total_groups=len(groups),
+                groups=groups,
+            )
+            self._store(user_id, report)
+            return report
+
+        return self._scans.do(user_id, run)
+
+    def get(self, user_id: int, db: Session, refresh: bool = False) -> Optional[DuplicateReport]:
+        # None means the book is too large to scan in the request.
+        if not refresh and (report := self.cached(user_id)) is not None:
+            return report
+        if ContactRepository(db).count_by_user(user_id) > settings.duplicate_sync_limit:
+            return None
+        return self.scan(user_id, db)
+
+    def schedule(self, user_id: int) -> bool:
+        # False if a background scan for the user is already queued.
+        with self._lock:
+            if user_id in self._pending:
+                return False
+            self._pending.add(user_id)
+            return True
+
+    def _unschedule(self, user_id: int) -> None:
+        with self._lock:
+            self._pending.discard(user_id)
+
+    def run_scan(self, user_id: int) -> None:
+        # Background task: runs with its own sessions after the request
+        # session is closed.
+        try:
+            with SessionLocal() as db:
+                user = UserRepository(db).get_by_id(user_id)
+                if user is None:
+                    return
+                with shard_router.contact_session(user, db) as contact_db:
+                    self.scan(user_id, contact_db)
+        except Exception as e:
+            print(f"Error scanning duplicates of user {user_id}: {e}")
+        finally:
+            self._unschedule(user_id)
+
+
+class RedisDuplicateFinder(DuplicateFinder):
+    # Reports and pending markers shared between workers: a client polling a
+    # 202 gets the report from whichever worker ran the scan, and a book is
+    # not scanned again by every worker it lands on. Both expire after
+    # DUPLICATE_CACHE_SECONDS, so a worker that dies mid-scan only delays a
+    # rescan. Falls back to the in-process cache while Redis is unreachable.
+    def __init__(self, url: str):
+        super().__init__()
+        self._redis = redis.Redis.from_url(url, socket_timeout=1.0)
+
+    def cached(self, user_id: int) -> Optional[DuplicateReport]:
+        try:
+            data = self._redis.get(f"duplicates:report:{user_id}")
+        except redis.RedisError:
+            return super().cached(user_id)
+        return None if data is None else DuplicateReport.model_validate_json(data)
+
+    def _store(self, user_id: int, report: DuplicateReport) -> None:
+        try:
+            self._redis.set(
+                f"duplicates:report:{user_id}", report.model_dump_json(), ex=settings.duplicate_cache_seconds
+            )
+        except redis.RedisError as e:
+            print(f"Error caching duplicate report: {e}")
+            super()._store(user_id, report)
+
+    def schedule(self, user_id: int) -> bool:
+        try:
+            return bool(self._redis.set(
+                f"duplicates:pending:{user_id}", 1, nx=True, ex=settings.duplicate_cache_seconds
+            ))
+        except redis.RedisError:
+            return super().schedule(user_id)
+
+    def _unschedule(self, user_id: int) -> None:
+        super()._unschedule(user_id)
+        try:
+            self._redis.delete(f"duplicates:pending:{user_id}")
+        except redis.RedisError as e:
+            print(f"Error clearing pending duplicate scan: {e}")
+
+
+@lru_cache
+def get_duplicate_finder() -> DuplicateFinder:
+    if settings.redis_url:
+        return RedisDuplicateFinder(settings.redis_url)
+    return DuplicateFinder()
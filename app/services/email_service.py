@@ -1,34 +1,51 @@
-from typing import List
+from datetime import date
+from functools import lru_cache
+from html import escape
+from typing import List, Callable, Awaitable
 from pathlib import Path
+from fastapi import BackgroundTasks
 from fastapi_mail import FastMail, MessageSchema, ConnectionConfig, MessageType
 from fastapi_mail.errors import ConnectionErrors
 from pydantic import EmailStr
 
+from app.core import metrics
 from app.core.config import settings
 
-conf = ConnectionConfig(
-    MAIL_USERNAME=settings.mail_username,
-    MAIL_PASSWORD=settings.mail_password,
-    MAIL_FROM=settings.mail_from,
-    MAIL_PORT=settings.mail_port,
-    MAIL_SERVER=settings.mail_server,
-    MAIL_FROM_NAME=settings.mail_from_name,
-    MAIL_STARTTLS=settings.mail_starttls,
-    MAIL_SSL_TLS=settings.mail_ssl_tls,
-    USE_CREDENTIALS=settings.mail_use_credentials,
-    VALIDATE_CERTS=settings.mail_validate_certs,
-    TEMPLATE_FOLDER=Path(__file__).parent / 'templates',
-)
+TEMPLATE_FOLDER = Path(__file__).parent / 'templates'
 
 
-async def send_verification_email(
-    email: EmailStr,
-    username: str,
-    verification_token: str
-) -> bool:
-    verification_url = f"{settings.backend_url}/auth/verify-email/{verification_token}"
+@lru_cache
+def get_mail_config() -> ConnectionConfig:
+    return ConnectionConfig(
+        MAIL_USERNAME=settings.mail_username,
+        MAIL_PASSWORD=settings.mail_password,
+        MAIL_FROM=settings.mail_from,
+        MAIL_PORT=settings.mail_port,
+        MAIL_SERVER=settings.mail_server,
+        MAIL_FROM_NAME=settings.mail_from_name,
+        MAIL_STARTTLS=settings.mail_starttls,
+        MAIL_SSL_TLS=settings.mail_ssl_tls,
+        USE_CREDENTIALS=settings.mail_use_credentials,
+        VALIDATE_CERTS=settings.mail_validate_certs,
+        # Emails are rendered inline; ConnectionConfig rejects a missing folder.
+        TEMPLATE_FOLDER=TEMPLATE_FOLDER if TEMPLATE_FOLDER.is_dir() else None,
+    )
+
 
-    html_content = f"""
+async def _send_queued(send: Callable[..., Awaitable[bool]], *args) -> bool:
+    try:
+        return await send(*args)
+    finally:
+        metrics.email_queue_depth.dec()
+
+
+def enqueue_email(background_tasks: BackgroundTasks, send: Callable[..., Awaitable[bool]], *args) -> None:
+    metrics.email_queue_depth.inc()
+    background_tasks.add_task(_send_queued, send, *args)
+
+
+def _render_email(title: str, content: str) -> str:
+    return f"""
     <html>
         <head>
             <style>
@@ -64,6 +81,9 @@ async def send_verification_email(
                     border-radius: 5px;
                     font-weight: bold;
                 }}
+                td {{
+                    padding: 4px 12px 4px 0;
+                }}
                 .footer {{
                     margin-top: 20px;
                     padding-top: 20px;
@@ -76,19 +96,9 @@ async def send_verification_email(
         <body>
             <div class="container">
                 <div class="header">
-                    <h1>Welcome to Contacts API!</h1>
+                    <h1>{title}</h1>
                 </div>
-                <div class="content">
-                    <h2>Hello {username}!</h2>
-                    <p>Thank you for registering with Contacts API. To complete your registration and activate your account, please verify your email address.</p>
-                    <p>Click the button below to verify your email:</p>
-                    <center>
-                        <a href="{verification_url}" class="button">Verify Email Address</a>
-                    </center>
-                    <p>Or copy and paste this link into your browser:</p>
-                    <p style="word-break: break-all; color: #666;">{verification_url}</p>
-                    <p>This link will expire in 24 hours.</p>
-                    <p>If you didn't create an account, you can safely ignore this email.</p>
+                <div class="content">{content}
                 </div>
                 <div class="footer">
                     <p>Best regards,<br>Contacts API Team</p>
@@ -99,6 +109,29 @@ async def send_verification_email(
     </html>
     """
 
+
+async def send_verification_email(
+    email: EmailStr,
+    username: str,
+    verification_token: str
+) -> bool:
+    verification_url = f"{settings.backend_url}/auth/verify-email/{verification_token}"
+
+    html_content = _render_email(
+        "Welcome to Contacts API!",
+        f"""
+                    <h2>Hello {username}!</h2>
+                    <p>Thank you for registering with Contacts API. To complete your registration and activate your account, please verify your email address.</p>
+                    <p>Click the button below to verify your email:</p>
+                    <center>
+                        <a href="{verification_url}" class="button">Verify Email Address</a>
+                    </center>
+                    <p>Or copy and paste this link into your browser:</p>
+                    <p style="word-break: break-all; color: #666;">{verification_url}</p>
+                    <p>This link will expire in 24 hours.</p>
+                    <p>If you didn't create an account, you can safely ignore this email.</p>"""
+    )
+
     try:
         message = MessageSchema(
             subject="Verify your email address - Contacts API",
@@ -107,7 +140,7 @@ async def send_verification_email(
             subtype=MessageType.html,
         )
 
-        fm = FastMail(conf)
+        fm = FastMail(get_mail_config())
         await fm.send_message(message)
         print(f"✓ Verification email sent to {email}")
         print(f"✓ Verification URL: {verification_url}")
@@ -122,3 +155,47 @@ async def send_verification_email(
         print(f"✓ Verification URL (use this for testing): {verification_url}")
         return False
 
+
+def birthday_digest_message(
+    email: EmailStr,
+    username: str,
+    birthdays: List[tuple[str, date, int]]
+) -> MessageSchema:
+    # birthdays: (contact name, upcoming birthday, age on that day)
+    rows = "".join(
+        f"""
+                        <tr>
+                            <td>{day:%a, %d %b}</td>
+                            <td>{escape(name)}</td>
+                            <td>turns {age}</td>
+                        </tr>"""
+        for name, day, age in birthdays
+    )
+    html_content = _render_email(
+        "Upcoming birthdays",
+        f"""
+                    <h2>Hello {escape(username)}!</h2>
+                    <p>These contacts have birthdays coming up:</p>
+                    <table>{rows}
+                    </table>"""
+    )
+    return MessageSchema(
+        subject=f"{len(birthdays)} upcoming birthday{'s' if len(birthdays) != 1 else ''} - Contacts API",
+        recipients=[email],
+        body=html_content,
+        subtype=MessageType.html,
+    )
+
+
+async def send_birthday_digests(messages: List[MessageSchema]) -> bool:
+    # One SMTP connection for all of them; False if any was not sent.
+    try:
+        fm = FastMail(get_mail_config())
+        await fm.send_message(messages)
+        return True
+    except ConnectionErrors as e:
+        print(f"✗ Error sending {len(messages)} birthday digests: {e}")
+        return False
+    except Exception as e:
+        print(f"✗ Unexpected error sending birthday digests: {e}")
+        return False
@@ -0,0 +1,144 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from functools import lru_cache
+from typing import Optional
+
+import redis.asyncio as redis
+from sqlalchemy import Engine, create_engine, make_url, text
+from sqlalchemy.pool import QueuePool
+
+from app.core.config import settings
+from app.db.database import get_engine
+from app.middleware.metrics import get_in_flight
+
+
+@dataclass
+class ProbeResult:
+    ok: bool
+    latency_ms: float
+    critical: bool = True
+    error: Optional[str] = None
+
+
+# The database probe has its own connection and thread: a probe stuck on a
+# saturated database then holds neither a request pool connection nor a
+# request threadpool worker, and at most one probe runs at a time.
+_probe_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="readiness-probe")
+
+
+@lru_cache
+def get_probe_engine() -> Engine:
+    timeout = settings.readiness_probe_timeout_seconds
+    url = make_url(settings.database_url)
+    if url.get_backend_name() == "sqlite":
+        return create_engine(url, connect_args={"timeout": timeout})
+    connect_args = {}
+    if url.get_backend_name() == "postgresql":
+        connect_args = {
+            "connect_timeout": max(1, int(timeout)),
+            "options": f"-c statement_timeout={int(timeout * 1000)}",
+        }
+    return create_engine(url, pool_size=1, max_overflow=0, pool_timeout=timeout, connect_args=connect_args)
+
+
+def _probe_database() -> None:
+    with get_probe_engine().connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+
+async def _run_probe_database() -> None:
+    await asyncio.get_running_loop().run_in_executor(_probe_executor, _probe_database)
+
+
+def pool_usage() -> Optional[float]:
+    # Share of the request pool's connections (DB_POOL_SIZE plus
+    # DB_MAX_OVERFLOW) in use; None for pools without a fixed capacity.
+    pool = get_engine().pool
+    if not isinstance(pool, QueuePool) or settings.db_max_overflow < 0:
+        return None
+    capacity = settings.db_pool_size + settings.db_max_overflow
+    return pool.checkedout() / capacity if capacity else None
+
+
+async def _timed(probe, critical: bool = True) -> ProbeResult:
+    started_at = time.perf_counter()
+    try:
+        await asyncio.wait_for(probe(), timeout=settings.readiness_probe_timeout_seconds)
+        result = ProbeResult(ok=True, latency_ms=0.0, critical=critical)
+    except asyncio.TimeoutError:
+        result = ProbeResult(ok=False, latency_ms=0.0, critical=critical, error="timeout")
+    except Exception as e:
+        result = ProbeResult(ok=False, latency_ms=0.0, critical=critical, error=str(e))
+    result.latency_ms = round((time.perf_counter() - started_at) * 1000, 2)
+    return result
+
+
+class ReadinessService:
+    def __init__(self):
+        self._lock = asyncio.Lock()
+        self._checks: dict[str, ProbeResult] = {}
+        self._checked_at = 0.0
+        self._redis: Optional[redis.Redis] = None
+
+    async def close(self) -> None:
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+        if get_probe_engine.cache_info().currsize:
+            get_probe_engine().dispose()
+            get_probe_engine.cache_clear()
+
+    async def _probe_redis(self) -> None:
+        if self._redis is None:
+            self._redis = redis.from_url(settings.redis_url)
+        await self._redis.ping()
+
+    @staticmethod
+    async def _probe_smtp() -> None:
+        _, writer = await asyncio.open_connection(settings.mail_server, settings.mail_port)
+        writer.close()
+        await writer.wait_closed()
+
+    async def _run_probes(self) -> dict[str, ProbeResult]:
+        probes = {
+            "database": _timed(_run_probe_database),
+            "smtp": _timed(self._probe_smtp, critical=settings.readiness_require_smtp),
+        }
+        if settings.redis_url:
+            probes["redis"] = _timed(self._probe_redis)
+        results = await asyncio.gather(*probes.values())
+        return dict(zip(probes, results))
+
+    async def get_checks(self) -> dict[str, ProbeResult]:
+        # Probes are cached so that frequent load balancer polling does not
+        # itself become load on the dependencies.
+        async with self._lock:
+            if time.monotonic() - self._checked_at >= settings.readiness_cache_seconds:
+                self._checks = await self._run_probes()
+                self._checked_at = time.monotonic()
+            return self._checks
+
+    async def check(self) -> tuple[bool, dict]:
+        checks = await self.get_checks()
+        reasons = [f"{name}: {result.error}" for name, result in checks.items() if result.critical and not result.ok]
+
+        usage = pool_usage()
+        if usage is not None and usage >= settings.readiness_max_pool_usage:
+            reasons.append(f"database: {usage:.0%} of pool connections in use")
+
+        in_flight = get_in_flight()
+        if in_flight > settings.readiness_max_in_flight:
+            reasons.append(f"in-flight requests {in_flight} exceed {settings.readiness_max_in_flight}")
+
+        return not reasons, {
+            "status": "ready" if not reasons else "unready",
+            "reasons": reasons,
+            "in_flight": in_flight,
+            "pool_usage": round(usage, 2) if usage is not None else None,
+            "checks": {name: asdict(result) for name, result in checks.items()},
+        }
+
+
+readiness_service = ReadinessService()
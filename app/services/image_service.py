@@ -0,0 +1,96 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from typing import Optional
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from app.core.config import settings
+
+# No face detection is done (Pillow has none): avatars are portraits, so the
+# square crop is a fixed center crop biased towards the upper part of the
+# frame where the face usually is.
+AVATAR_CENTERING = (0.5, 0.4)
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+class ImageProcessingError(Exception):
+    pass
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=settings.image_process_workers)
+    return _executor
+
+
+def shutdown_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def _encode_webp(image: Image.Image, quality: int) -> bytes:
+    buffer = BytesIO()
+    image.save(buffer, format="WEBP", quality=quality, method=4)
+    return buffer.getvalue()
+
+
+def _encode_jpeg(image: Image.Image, quality: int) -> bytes:
+    buffer = BytesIO()
+    image.convert("RGB").save(buffer, format="JPEG", quality=quality, optimize=True, progressive=True)
+    return buffer.getvalue()
+
+
+# Settings.avatar_format -> (content type, encoder)
+AVATAR_FORMATS = {
+    "WEBP": ("image/webp", _encode_webp),
+    "JPEG": ("image/jpeg", _encode_jpeg),
+}
+
+
+def normalize_avatar(
+    contents: bytes,
+    sizes: tuple[int, ...],
+    image_format: str,
+    quality: int
+) -> dict[int, bytes]:
+    try:
+        with Image.open(BytesIO(contents)) as source:
+            largest = max(sizes)
+            # Lets the JPEG decoder downscale while decoding instead of
+            # materializing the full-resolution bitmap.
+            source.draft("RGB", (largest * 2, largest * 2))
+            image = ImageOps.exif_transpose(source)
+            image = image.convert("RGBA" if "A" in image.getbands() and image_format == "WEBP" else "RGB")
+
+            base = ImageOps.fit(
+                image,
+                (largest, largest),
+                method=Image.Resampling.LANCZOS,
+                centering=AVATAR_CENTERING,
+            )
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError) as e:
+        raise ImageProcessingError("File is not a valid image") from e
+
+    _, encode = AVATAR_FORMATS[image_format]
+    variants = {}
+    for size in sorted(sizes, reverse=True):
+        variant = base if size == largest else base.resize((size, size), Image.Resampling.LANCZOS)
+        variants[size] = encode(variant, quality)
+    return variants
+
+
+async def process_avatar(contents: bytes) -> dict[int, bytes]:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _get_executor(),
+        normalize_avatar,
+        contents,
+        tuple(settings.avatar_sizes),
+        settings.avatar_format,
+        settings.avatar_quality,
+    )
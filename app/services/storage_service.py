@@ -0,0 +1,87 @@
+import hashlib
+import os
+import shutil
+import tempfile
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from pathlib import Path
+
+from starlette.staticfiles import StaticFiles
+
+from app.core.config import settings
+
+CONTENT_TYPE_EXTENSIONS = {
+    "image/webp": ".webp",
+    "image/jpeg": ".jpg",
+}
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+class StorageBackend(ABC):
+
+    @abstractmethod
+    def save(self, data: bytes, key: str, content_type: str) -> str:
+        ...
+
+    @abstractmethod
+    def delete(self, key: str) -> bool:
+        ...
+
+
+class LocalStorageBackend(StorageBackend):
+    def __init__(self, root: str, base_url: str):
+        self.root = Path(root)
+        self.base_url = base_url.rstrip("/")
+
+    def save(self, data: bytes, key: str, content_type: str) -> str:
+        # Files are addressed by key and content hash: a new image gets a new
+        # URL, so responses can be cached as immutable, and every file of a
+        # key is in its own directory for delete().
+        digest = hashlib.sha256(data).hexdigest()
+        relative_path = f"{key}/{digest}{CONTENT_TYPE_EXTENSIONS.get(content_type, '')}"
+        path = self.root / relative_path
+
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+            try:
+                with os.fdopen(fd, "wb") as tmp_file:
+                    tmp_file.write(data)
+                    tmp_file.flush()
+                    os.fsync(tmp_file.fileno())
+                os.chmod(tmp_path, 0o644)
+                os.replace(tmp_path, path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+                raise
+
+        return f"{self.base_url}/{relative_path}"
+
+    def delete(self, key: str) -> bool:
+        path = self.root / key
+        if not path.is_dir():
+            return False
+        shutil.rmtree(path)
+        return True
+
+
+class ImmutableStaticFiles(StaticFiles):
+    def file_response(self, *args, **kwargs):
+        response = super().file_response(*args, **kwargs)
+        response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        return response
+
+
+@lru_cache
+def get_storage_backend() -> StorageBackend:
+    if settings.avatar_storage_backend == "local":
+        return LocalStorageBackend(
+            settings.local_storage_dir,
+            f"{settings.backend_url}{settings.local_storage_url_path}",
+        )
+    if settings.avatar_storage_backend == "cloudinary":
+        from app.services.cloudinary_service import CloudinaryStorageBackend
+        return CloudinaryStorageBackend()
+    raise ValueError(f"Unknown avatar storage backend: {settings.avatar_storage_backend}")
@@ -4,7 +4,9 @@ from sqlalchemy.orm import Session
 from app.repositories.user_repository import UserRepository
 from app.schemas.user import UserCreate
 from app.domain.user import User
+from app.core.config import settings
 from app.core.security import verify_password
+from app.services.avatar_service import avatar_service
 
 
 class UserAlreadyExistsError(Exception):
@@ -27,7 +29,7 @@ class UserService:
 
     def authenticate_user(self, email: str, password: str) -> Optional[User]:
         user = self.repository.get_by_email(email)
-        if not user:
+        if not user or user.deletion_pending:
             return None
         if not verify_password(password, user.hashed_password):
             return None
@@ -45,5 +47,7 @@ class UserService:
     def confirm_email(self, email: str) -> Optional[User]:
         return self.repository.confirm_email(email)
 
-    def update_avatar(self, user_id: int, avatar_url: str) -> Optional[User]:
-        return self.repository.update_avatar(user_id, avatar_url)
+    def update_avatar(self, user_id: int, avatar_urls: dict[str, str]) -> Optional[User]:
+        # users.avatar is the variant for the largest configured size.
+        avatar = avatar_service.get_avatar_variant_url(avatar_urls, max(settings.avatar_sizes))
+        return self.repository.update_avatar(user_id, avatar, avatar_urls)
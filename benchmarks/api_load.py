@@ -0,0 +1,320 @@
+"""Load test of the real API: throughput and p50/p95/p99 latency per scenario.
+
+Drives `main.app` in-process through httpx's ASGI transport against a fresh
+SQLite file (or --database-url), with SMTP mocked out and avatars on the
+local storage backend. With --url it drives a running server instead; that
+server must be configured by the caller.
+
+    python -m benchmarks.api_load
+    python -m benchmarks.api_load --scenarios list,search --requests 2000 --concurrency 32
+    python -m benchmarks.api_load --output results.json
+    python -m benchmarks.api_load --compare results.json --threshold 0.1
+    python -m benchmarks.api_load --scenarios login,register --bcrypt-rounds 4
+
+Scenarios: login, register, list, search, birthdays, crud. Results are
+written as JSON; --compare exits with status 1 when a scenario's p95 grew
+or its throughput dropped by more than the threshold.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from typing import Awaitable, Callable, Optional
+from unittest import mock
+
+import httpx
+
+PASSWORD = "benchmark-password"
+FIRST_NAMES = ["Olena", "Taras", "Iryna", "Andrii", "Maria", "Dmytro", "Sofia", "Bohdan", "Anna", "Yurii"]
+LAST_NAMES = ["Shevchenko", "Kovalenko", "Bondarenko", "Tkachenko", "Melnyk", "Kravchenko", "Boyko"]
+
+
+@dataclass
+class BenchUser:
+    email: str
+    headers: dict
+    contact_ids: list[int] = field(default_factory=list)
+
+
+@dataclass
+class Context:
+    users: list[BenchUser]
+    run_id: str
+    created: list[tuple[BenchUser, int]] = field(default_factory=list)
+
+
+def contact_payload(rng: random.Random, i: int) -> dict:
+    first_name = rng.choice(FIRST_NAMES)
+    return {
+        "first_name": first_name,
+        "last_name": rng.choice(LAST_NAMES),
+        "email": f"{first_name.lower()}.{i}@example.com",
+        "phone_number": f"+38050{rng.randrange(10**7):07d}",
+        "date_of_birth": date(rng.randrange(1950, 2005), rng.randrange(1, 13), rng.randrange(1, 29)).isoformat(),
+    }
+
+
+async def login(client: httpx.AsyncClient, ctx: Context, i: int) -> httpx.Response:
+    user = ctx.users[i % len(ctx.users)]
+    return await client.post("/auth/login", data={"username": user.email, "password": PASSWORD})
+
+
+async def register(client: httpx.AsyncClient, ctx: Context, i: int) -> httpx.Response:
+    email = f"bench-{ctx.run_id}-{i}@example.com"
+    return await client.post("/auth/register", json={"email": email, "password": PASSWORD})
+
+
+async def list_contacts(client: httpx.AsyncClient, ctx: Context, i: int) -> httpx.Response:
+    user = ctx.users[i % len(ctx.users)]
+    return await client.get("/contacts/", params={"page": i % 5 + 1, "page_size": 20}, headers=user.headers)
+
+
+async def search(client: httpx.AsyncClient, ctx: Context, i: int) -> httpx.Response:
+    user = ctx.users[i % len(ctx.users)]
+    query = FIRST_NAMES[i % len(FIRST_NAMES)][:3]
+    return await client.get("/contacts/search", params={"q": query, "page_size": 20}, headers=user.headers)
+
+
+async def birthdays(client: httpx.AsyncClient, ctx: Context, i: int) -> httpx.Response:
+    user = ctx.users[i % len(ctx.users)]
+    return await client.get("/contacts/birthdays", params={"days": 30}, headers=user.headers)
+
+
+async def crud(client: httpx.AsyncClient, ctx: Context, i: int) -> httpx.Response:
+    # 50% reads, 20% updates, 20% creates, 10% deletes of contacts created here.
+    rng = random.Random(i)
+    user = ctx.users[i % len(ctx.users)]
+    step = i % 10
+    if step == 9 and ctx.created:
+        owner, contact_id = ctx.created.pop()
+        return await client.delete(f"/contacts/{contact_id}", headers=owner.headers)
+    if step in (7, 8):
+        response = await client.post("/contacts/", json=contact_payload(rng, 10**6 + i), headers=user.headers)
+        if response.status_code == 201:
+            ctx.created.append((user, response.json()["id"]))
+        return response
+    contact_id = rng.choice(user.contact_ids)
+    if step in (5, 6):
+        return await client.put(
+            f"/contacts/{contact_id}",
+            json={"phone_number": f"+38067{rng.randrange(10**7):07d}"},
+            headers=user.headers,
+        )
+    return await client.get(f"/contacts/{contact_id}", headers=user.headers)
+
+
+@dataclass
+class Scenario:
+    request: Callable[[httpx.AsyncClient, Context, int], Awaitable[httpx.Response]]
+    requests: int
+    concurrency: int
+
+
+# bcrypt-bound scenarios default to fewer requests and the auth budget of
+# admission control, otherwise they mostly measure 503s.
+SCENARIOS = {
+    "login": Scenario(login, requests=40, concurrency=4),
+    "register": Scenario(register, requests=40, concurrency=4),
+    "list": Scenario(list_contacts, requests=1000, concurrency=16),
+    "search": Scenario(search, requests=1000, concurrency=16),
+    "birthdays": Scenario(birthdays, requests=1000, concurrency=16),
+    "crud": Scenario(crud, requests=1000, concurrency=16),
+}
+
+
+async def seed(client: httpx.AsyncClient, users: int, contacts: int, run_id: str) -> Context:
+    rng = random.Random(0)
+    bench_users = []
+    for u in range(users):
+        email = f"seed-{run_id}-{u}@example.com"
+        response = await client.post("/auth/register", json={"email": email, "password": PASSWORD})
+        response.raise_for_status()
+        response = await client.post("/auth/login", data={"username": email, "password": PASSWORD})
+        response.raise_for_status()
+        user = BenchUser(email, {"Authorization": f"Bearer {response.json()['access_token']}"})
+
+        for start in range(0, contacts, 100):
+            operations = [
+                {"op": "create", "data": contact_payload(rng, i)}
+                for i in range(start, min(start + 100, contacts))
+            ]
+            response = await client.post("/contacts/batch", json={"operations": operations}, headers=user.headers)
+            response.raise_for_status()
+            user.contact_ids += [result["contact"]["id"] for result in response.json()["results"]]
+        bench_users.append(user)
+    return Context(bench_users, run_id)
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    index = min(len(sorted_values) - 1, round(q * (len(sorted_values) - 1)))
+    return sorted_values[index]
+
+
+async def run_scenario(client: httpx.AsyncClient, ctx: Context, scenario: Scenario, requests: int, concurrency: int) -> dict:
+    latencies = []
+    statuses = Counter()
+    counter = itertools.count()
+
+    async def worker() -> None:
+        while (i := next(counter)) < requests:
+            started = time.perf_counter()
+            response = await scenario.request(client, ctx, i)
+            latencies.append(time.perf_counter() - started)
+            statuses[response.status_code] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    duration = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "duration_s": round(duration, 3),
+        "throughput_rps": round(requests / duration, 1),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        "errors": sum(count for status, count in statuses.items() if status >= 400),
+        "status_codes": {str(status): count for status, count in sorted(statuses.items())},
+    }
+
+
+def make_client(url: Optional[str]) -> httpx.AsyncClient:
+    if url:
+        return httpx.AsyncClient(base_url=url, timeout=60)
+
+    import main  # noqa: E402 - imported after the environment is configured
+    transport = httpx.ASGITransport(app=main.app)
+    return httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=60)
+
+
+def prepare_in_process(database_url: Optional[str], bcrypt_rounds: Optional[int]) -> str:
+    if not database_url:
+        database_url = f"sqlite:///{tempfile.mkdtemp(prefix='api-load-')}/benchmark.db"
+    os.environ["DATABASE_URL"] = database_url
+    # Settings are read when app is first imported, which happens below.
+    if bcrypt_rounds is not None:
+        os.environ["BCRYPT_ROUNDS"] = str(bcrypt_rounds)
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret-key-benchmark-secret-key")
+    os.environ.setdefault("AVATAR_STORAGE_BACKEND", "local")
+
+    from sqlalchemy import create_engine
+    from app.domain import account_deletion, contact, user  # noqa: F401 - Import to register models
+    from app.domain.base import metadata_
+    metadata_.create_all(create_engine(database_url))
+
+    # No mail server in a benchmark run: verification emails are no-ops, and
+    # per-request SQL warnings are silenced so logging does not skew timings.
+    mock.patch("app.api.auth.send_verification_email", new=mock.AsyncMock()).start()
+    logging.getLogger("app").setLevel(logging.ERROR)
+    return database_url
+
+
+async def run(args: argparse.Namespace, target: str) -> dict:
+    run_id = uuid.uuid4().hex[:8]
+    results = {}
+    async with make_client(args.url) as client:
+        ctx = await seed(client, args.users, args.contacts, run_id)
+        for name in args.scenarios:
+            scenario = SCENARIOS[name]
+            stats = await run_scenario(
+                client,
+                ctx,
+                scenario,
+                args.requests or scenario.requests,
+                args.concurrency or scenario.concurrency,
+            )
+            results[name] = stats
+            print(
+                f"{name:>10} {stats['throughput_rps']:>9.1f} req/s  p50 {stats['p50_ms']:>8.2f} ms"
+                f"  p95 {stats['p95_ms']:>8.2f} ms  p99 {stats['p99_ms']:>8.2f} ms  errors {stats['errors']}"
+            )
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "target": target,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "users": args.users,
+            "contacts_per_user": args.contacts,
+            "bcrypt_rounds": args.bcrypt_rounds,
+        },
+        "scenarios": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    regressions = []
+    print(f"\n{'scenario':>10} {'req/s':>16} {'p95 ms':>20}")
+    for name, stats in current["scenarios"].items():
+        before = baseline["scenarios"].get(name)
+        if before is None:
+            continue
+        throughput_change = stats["throughput_rps"] / before["throughput_rps"] - 1
+        p95_change = stats["p95_ms"] / before["p95_ms"] - 1
+        print(
+            f"{name:>10} {before['throughput_rps']:>7.1f} -> {stats['throughput_rps']:<7.1f}"
+            f" {before['p95_ms']:>8.2f} -> {stats['p95_ms']:<8.2f} ({p95_change:+.0%})"
+        )
+        if throughput_change < -threshold:
+            regressions.append(f"{name}: throughput {throughput_change:+.0%}")
+        if p95_change > threshold:
+            regressions.append(f"{name}: p95 {p95_change:+.0%}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        type=lambda value: [name.strip() for name in value.split(",") if name.strip()])
+    parser.add_argument("--requests", type=int, help="requests per scenario (default: per scenario)")
+    parser.add_argument("--concurrency", type=int, help="concurrent clients (default: per scenario)")
+    parser.add_argument("--users", type=int, default=4, help="seeded users")
+    parser.add_argument("--contacts", type=int, default=500, help="seeded contacts per user")
+    parser.add_argument("--url", help="benchmark a running server instead of the in-process app")
+    parser.add_argument("--database-url", help="database for the in-process app (default: temporary SQLite file)")
+    parser.add_argument("--bcrypt-rounds", type=int,
+                        help="bcrypt cost of the in-process app, e.g. 4 to take it out of login/register")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed relative regression")
+    args = parser.parse_args()
+
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    if args.url and args.bcrypt_rounds is not None:
+        parser.error("--bcrypt-rounds only applies to the in-process app")
+
+    target = args.url or prepare_in_process(args.database_url, args.bcrypt_rounds)
+    results = asyncio.run(run(args, target))
+
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2)
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            regressions = compare(results, json.load(baseline_file), args.threshold)
+        if regressions:
+            print("\nRegressions:\n  " + "\n  ".join(regressions))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
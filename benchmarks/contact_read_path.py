@@ -0,0 +1,86 @@
+"""Per-row CPU and memory of the contact list read path.
+
+Compares loading ORM Contact entities (identity map + from_attributes on the
+entity) with the Core row path used by ContactRepository.get_all, against an
+in-memory SQLite database.
+
+    python -m benchmarks.contact_read_path
+"""
+import timeit
+import tracemalloc
+from datetime import date
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.domain import account_deletion, contact, user  # noqa: F401 - Import to register models
+from app.domain.base import metadata_
+from app.domain.contact import Contact
+from app.domain.user import User
+from app.repositories.contact_repository import ContactRepository
+from app.schemas.contact import ContactListResponse
+
+PAGE_SIZES = (10, 100, 1000)
+
+
+def setup_database(rows: int) -> Session:
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    metadata_.create_all(engine)
+    session = Session(engine)
+    session.add(User(id=1, email="bench@example.com", hashed_password="x"))
+    session.commit()
+    session.execute(insert(Contact), [
+        {
+            "first_name": "John",
+            "last_name": "Doe",
+            "email": f"john.doe{i}@example.com",
+            "phone_number": "+380501234567",
+            "date_of_birth": date(1990, 1 + i % 12, 1 + i % 28),
+            "additional_data": "Met at the conference",
+            "user_id": 1,
+        }
+        for i in range(rows)
+    ])
+    session.commit()
+    return session
+
+
+def orm_page(session: Session, limit: int) -> bytes:
+    query = session.query(Contact).filter(Contact.user_id == 1)
+    total = query.count()
+    contacts = query.order_by(Contact.id).limit(limit).all()
+    body = ContactListResponse(contacts=contacts, total=total, page=1, page_size=limit).model_dump_json()
+    session.expunge_all()
+    return body
+
+
+def core_page(session: Session, limit: int) -> bytes:
+    rows, total = ContactRepository(session).get_all(1, 0, limit)
+    return ContactListResponse(contacts=rows, total=total, page=1, page_size=limit).model_dump_json()
+
+
+def measure(func, session: Session, limit: int) -> tuple[float, int]:
+    number = max(3, 3000 // limit)
+    seconds = min(timeit.repeat(lambda: func(session, limit), number=number, repeat=5)) / number
+    tracemalloc.start()
+    func(session, limit)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def main() -> None:
+    session = setup_database(max(PAGE_SIZES))
+    print(f"{'rows':>6} {'ORM us/row':>11} {'Core us/row':>12} {'ORM peak KiB':>13} {'Core peak KiB':>14}")
+    for size in PAGE_SIZES:
+        orm_seconds, orm_peak = measure(orm_page, session, size)
+        core_seconds, core_peak = measure(core_page, session, size)
+        print(
+            f"{size:>6} {orm_seconds / size * 1e6:>11.2f} {core_seconds / size * 1e6:>12.2f} "
+            f"{orm_peak / 1024:>13.1f} {core_peak / 1024:>14.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
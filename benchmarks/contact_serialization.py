@@ -0,0 +1,66 @@
+"""Serialization cost of ContactListResponse pages.
+
+Compares the read model against the previous response schema, which
+inherited the input validators from ContactBase.
+
+    python -m benchmarks.contact_serialization
+"""
+import timeit
+from datetime import date
+from types import SimpleNamespace
+
+from pydantic import BaseModel
+
+from app.schemas.contact import ContactBase, ContactListResponse
+
+PAGE_SIZES = (10, 100, 1000)
+
+
+class ValidatingContactResponse(ContactBase):
+    id: int
+
+    model_config = {"from_attributes": True}
+
+
+class ValidatingContactListResponse(BaseModel):
+    contacts: list[ValidatingContactResponse]
+    total: int
+    page: int
+    page_size: int
+
+
+def make_rows(count: int) -> list[SimpleNamespace]:
+    return [
+        SimpleNamespace(
+            id=i,
+            first_name="John",
+            last_name="Doe",
+            email=f"john.doe{i}@example.com",
+            phone_number="+380501234567",
+            date_of_birth=date(1990, 1 + i % 12, 1 + i % 28),
+            additional_data="Met at the conference" if i % 2 else None,
+        )
+        for i in range(count)
+    ]
+
+
+def bench(list_model: type[BaseModel], rows: list, number: int) -> float:
+    def run():
+        page = list_model(contacts=rows, total=len(rows), page=1, page_size=len(rows))
+        return page.model_dump_json()
+
+    return min(timeit.repeat(run, number=number, repeat=5)) / number
+
+
+def main() -> None:
+    print(f"{'rows':>6} {'validating (ms)':>16} {'read model (ms)':>16} {'speedup':>8}")
+    for size in PAGE_SIZES:
+        rows = make_rows(size)
+        number = max(1, 2000 // size)
+        before = bench(ValidatingContactListResponse, rows, number)
+        after = bench(ContactListResponse, rows, number)
+        print(f"{size:>6} {before * 1000:>16.3f} {after * 1000:>16.3f} {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
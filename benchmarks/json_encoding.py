@@ -0,0 +1,59 @@
+"""Encode time and allocations of the JSON response paths.
+
+    python -m benchmarks.json_encoding
+
+- jsonable_encoder + json: JSONResponse as used by routes without a
+  response model (and by every route on older FastAPI releases)
+- pydantic dump_json: what FastAPI does for routes with a response model
+  when the default response class is left in place
+- FastJSONResponse: dump_python(mode="json") followed by orjson
+"""
+import json
+import timeit
+import tracemalloc
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.core.responses import FastJSONResponse
+from app.schemas.contact import ContactListResponse, ContactResponse
+from benchmarks.contact_serialization import make_rows
+
+ROWS = 100
+
+
+def encoders(payload, adapter: TypeAdapter) -> dict:
+    return {
+        "jsonable_encoder + json": lambda: json.dumps(
+            jsonable_encoder(payload), ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8"),
+        "pydantic dump_json": lambda: adapter.dump_json(payload),
+        "FastJSONResponse": lambda: FastJSONResponse(adapter.dump_python(payload, mode="json")).body,
+    }
+
+
+def peak_allocated(func) -> int:
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def report(title: str, payload, adapter: TypeAdapter) -> None:
+    print(title)
+    for name, func in encoders(payload, adapter).items():
+        seconds = min(timeit.repeat(func, number=200, repeat=5)) / 200
+        print(f"  {name:<24} {seconds * 1e6:>9.1f} us  peak {peak_allocated(func) / 1024:>8.1f} KiB")
+
+
+def main() -> None:
+    contacts = [ContactResponse.model_validate(row) for row in make_rows(ROWS)]
+    page = ContactListResponse(contacts=contacts, total=ROWS, page=1, page_size=ROWS)
+
+    report(f"GET /contacts/ ({ROWS} rows)", page, TypeAdapter(ContactListResponse))
+    report(f"GET /contacts/birthdays ({ROWS} rows)", contacts, TypeAdapter(list[ContactResponse]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Payload size and codec time of JSON vs MessagePack for a 100-row
+ContactListResponse page, as produced by NegotiatedResponse.
+
+    python -m benchmarks.msgpack_codec
+"""
+import gzip
+import json
+import timeit
+
+import msgpack
+import orjson
+
+from app.schemas.contact import ContactListResponse, ContactResponse
+from benchmarks.contact_serialization import make_rows
+
+ROWS = 100
+NUMBER = 1000
+
+
+def codecs() -> dict:
+    return {
+        "json (stdlib)": (lambda c: json.dumps(c).encode("utf-8"), json.loads),
+        "json (orjson)": (orjson.dumps, orjson.loads),
+        "msgpack": (msgpack.packb, msgpack.unpackb),
+    }
+
+
+def main() -> None:
+    contacts = [ContactResponse.model_validate(row) for row in make_rows(ROWS)]
+    content = ContactListResponse(
+        contacts=contacts, total=ROWS, page=1, page_size=ROWS
+    ).model_dump(mode="json")
+
+    print(f"{ROWS}-row page")
+    print(f"  {'codec':<15} {'bytes':>7} {'gzip bytes':>11} {'encode (us)':>12} {'decode (us)':>12}")
+    for name, (encode, decode) in codecs().items():
+        payload = encode(content)
+        encode_us = min(timeit.repeat(lambda: encode(content), number=NUMBER, repeat=5)) / NUMBER * 1e6
+        decode_us = min(timeit.repeat(lambda: decode(payload), number=NUMBER, repeat=5)) / NUMBER * 1e6
+        print(
+            f"  {name:<15} {len(payload):>7} {len(gzip.compress(payload)):>11} "
+            f"{encode_us:>12.1f} {decode_us:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Per-call overhead of repository lookups: legacy Query chains vs the
+2.0 select() statements used by the repositories, plus the same lookups as
+lambda statements for comparison.
+
+    python -m benchmarks.repository_overhead
+"""
+import os
+import timeit
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+
+from sqlalchemy import lambda_stmt, select  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.domain.contact import Contact  # noqa: E402
+from app.domain.user import User  # noqa: E402
+from app.repositories.contact_repository import ContactRepository  # noqa: E402
+from app.repositories.user_repository import UserRepository  # noqa: E402
+from benchmarks.contact_read_path import setup_database  # noqa: E402
+
+CALLS = 2000
+
+
+def legacy_calls(session: Session) -> dict:
+    return {
+        "contact get_by_id": lambda: session.query(Contact).filter(
+            Contact.id == 5, Contact.user_id == 1
+        ).first(),
+        "contact exists_by_email": lambda: session.query(Contact).filter(
+            Contact.email == "john.doe5@example.com", Contact.user_id == 1
+        ).filter(Contact.id != 7).first() is not None,
+        "user get_by_email": lambda: session.query(User).filter(
+            User.email == "bench@example.com"
+        ).first(),
+    }
+
+
+def lambda_calls(session: Session) -> dict:
+    def get_by_id(contact_id=5, user_id=1):
+        return session.scalars(lambda_stmt(lambda: select(Contact).where(
+            Contact.id == contact_id, Contact.user_id == user_id
+        ))).first()
+
+    def exists_by_email(email="john.doe5@example.com", user_id=1, exclude_id=7):
+        stmt = lambda_stmt(lambda: select(Contact.id).where(Contact.email == email, Contact.user_id == user_id))
+        stmt += lambda s: s.where(Contact.id != exclude_id)
+        stmt += lambda s: s.limit(1)
+        return session.scalar(stmt) is not None
+
+    def get_by_email(email="bench@example.com"):
+        return session.scalars(lambda_stmt(lambda: select(User).where(User.email == email))).first()
+
+    return {
+        "contact get_by_id": get_by_id,
+        "contact exists_by_email": exists_by_email,
+        "user get_by_email": get_by_email,
+    }
+
+
+def current_calls(session: Session) -> dict:
+    contacts = ContactRepository(session)
+    users = UserRepository(session)
+    return {
+        "contact get_by_id": lambda: contacts.get_by_id(5, 1),
+        "contact exists_by_email": lambda: contacts.exists_by_email("john.doe5@example.com", 1, exclude_id=7),
+        "user get_by_email": lambda: users.get_by_email("bench@example.com"),
+    }
+
+
+def main() -> None:
+    session = setup_database(100)
+    variants = {
+        "Query (us)": legacy_calls(session),
+        "select (us)": current_calls(session),
+        "lambda (us)": lambda_calls(session),
+    }
+    print(f"{'call':<26}" + "".join(f"{title:>13}" for title in variants))
+    for name in variants["Query (us)"]:
+        timings = [
+            min(timeit.repeat(calls[name], number=CALLS, repeat=5)) / CALLS
+            for calls in variants.values()
+        ]
+        print(f"{name:<26}" + "".join(f"{seconds * 1e6:>13.1f}" for seconds in timings))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,9 @@
-from fastapi import FastAPI, Request
+from contextlib import asynccontextmanager
+
+import anyio.to_thread
+from fastapi import FastAPI, Request, Response
+from fastapi.datastructures import Default
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
@@ -6,19 +11,56 @@ from slowapi.errors import RateLimitExceeded
 
 from app.api.contacts import router as contacts_router
 from app.api.auth import router as auth_router
+from app.api.health import router as health_router
 from app.core.config import settings
+from app.core.responses import FastJSONResponse
+from app.core.metrics import render_metrics, mark_process_dead
+from app.core.warmup import warm_up
+from app.db.database import dispose_engines
+from app.db.sharding import shard_router
+from app.middleware.admission import AdmissionControlMiddleware
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.metrics import MetricsMiddleware, sample_runtime_gauges
+from app.middleware.query_stats import QueryStatsMiddleware
+from app.services.health_service import readiness_service
+from app.services.image_service import shutdown_executor
+from app.services.storage_service import ImmutableStaticFiles
 
 limiter = Limiter(key_func=get_remote_address)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Sync routes and dependencies run on this pool; it should not exceed
+    # what the database pool and bcrypt limit can actually serve.
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.threadpool_size
+
+    # Clients are created lazily on first use; warm-up makes that happen
+    # before the worker takes traffic, and shutdown closes them.
+    if settings.warmup_enabled:
+        await warm_up()
+    yield
+    await readiness_service.close()
+    shutdown_executor()
+    dispose_engines()
+    shard_router.dispose()
+    mark_process_dead()
+
+
 app = FastAPI(
     title="Contacts API",
     description="API for managing contacts with CRUD operations and JWT authentication",
     version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse if settings.fast_json_responses else Default(JSONResponse),
 )
 
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
+# Middleware added later wraps the earlier ones: CORS headers are added to
+# the 503s of admission control too.
+app.add_middleware(AdmissionControlMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_origins,
@@ -27,18 +69,32 @@ app.add_middleware(
     allow_headers=settings.cors_allow_headers,
 )
 
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(MetricsMiddleware)
+
+app.include_router(health_router)
 app.include_router(auth_router)
 app.include_router(contacts_router)
 
+if settings.avatar_storage_backend == "local":
+    app.mount(
+        settings.local_storage_url_path,
+        ImmutableStaticFiles(directory=settings.local_storage_dir, check_dir=False),
+        name="avatars",
+    )
+
 
 @app.get("/")
 def read_root():
     return {"message": "Contacts API", "docs": "/docs"}
 
 
-@app.get("/health")
-def health_check():
-    return {"status": "ok"}
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    sample_runtime_gauges()
+    data, content_type = render_metrics()
+    return Response(content=data, media_type=content_type)
 
 
 if __name__ == "__main__":
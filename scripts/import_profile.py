@@ -0,0 +1,64 @@
+"""Import-time profile of the application.
+
+Runs `python -X importtime -c "import main"` in a fresh interpreter and
+reports the slowest imports, so worker start-up regressions are visible.
+
+    python -m scripts.import_profile
+    python -m scripts.import_profile --module app.api.contacts --top 15
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+
+def profile(module: str) -> tuple[list[tuple[int, int, str]], float]:
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    # Importing main reads settings, which requires these two.
+    env.setdefault("DATABASE_URL", "sqlite://")
+    env.setdefault("SECRET_KEY", "import-profile-secret-key")
+
+    started_at = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    wall_ms = (time.perf_counter() - started_at) * 1000
+    if result.returncode != 0:
+        raise SystemExit(result.stderr[-2000:])
+
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        entries.append((int(self_us), int(cumulative_us), name.rstrip()))
+    return entries, wall_ms
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--top", type=int, default=25)
+    args = parser.parse_args()
+
+    entries, wall_ms = profile(args.module)
+    # Top-level entries (no indentation) add up to the whole import.
+    total_ms = sum(cumulative for _, cumulative, name in entries if not name.startswith("  ")) / 1000
+
+    print(f"import {args.module}: {total_ms:.0f} ms imports, {wall_ms:.0f} ms interpreter wall time, "
+          f"{len(entries)} modules\n")
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for self_us, cumulative_us, name in sorted(entries, key=lambda entry: entry[1], reverse=True)[:args.top]:
+        print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {name.strip()}")
+
+    print("\nSlowest by own time:")
+    for self_us, _, name in sorted(entries, reverse=True)[:args.top // 2]:
+        print(f"{self_us / 1000:>14.1f} ms  {name.strip()}")
+
+
+if __name__ == "__main__":
+    main()
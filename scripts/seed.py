@@ -0,0 +1,269 @@
+"""Synthetic users and contacts for scale testing.
+
+    python -m scripts.seed --users 1000 --contacts 1000000 --seed 42
+    python -m scripts.seed --users 10 --contacts 5000 --database-url sqlite:///./scale.db --create-schema
+
+Names follow Zipf-like frequencies, birthdays a realistic age spread and
+book sizes a heavy-tailed distribution, so a few users own very large
+books. Output is identical for the same --seed and already in the form
+ContactCreate returns it, so a validated row equals the generated one.
+Contacts are loaded with COPY on PostgreSQL and executemany elsewhere.
+All seeded users share the password printed at the end.
+"""
+import argparse
+import csv
+import io
+import logging
+import math
+import os
+import random
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import insert, update
+
+FIRST_NAMES = [
+    "Olena", "Andrii", "Iryna", "Oleksandr", "Maria", "Dmytro", "Anna", "Serhii", "Natalia", "Volodymyr",
+    "Yulia", "Mykola", "Tetiana", "Ivan", "Oksana", "Taras", "Kateryna", "Yurii", "Sofia", "Bohdan",
+    "John", "Emma", "Michael", "Olivia", "David", "Sophia", "James", "Isabella", "Robert", "Mia",
+    "Anastasiia", "Maksym", "Viktoriia", "Roman", "Alina", "Artem", "Daria", "Vitalii", "Khrystyna", "Denys",
+    "Liam", "Ava", "Noah", "Charlotte", "Lucas", "Amelia", "Ethan", "Harper", "Mason", "Evelyn",
+]
+LAST_NAMES = [
+    "Melnyk", "Shevchenko", "Kovalenko", "Bondarenko", "Boyko", "Tkachenko", "Kravchenko", "Kovalchuk",
+    "Koval", "Oliynyk", "Shevchuk", "Polishchuk", "Tkachuk", "Savchenko", "Bondar", "Marchenko",
+    "Rudenko", "Moroz", "Lysenko", "Petrenko", "Smith", "Johnson", "Williams", "Brown", "Jones",
+    "Garcia", "Miller", "Davis", "Wilson", "Anderson", "Taylor", "Thomas", "Moore", "Martin", "Jackson",
+    "Klymenko", "Pavlenko", "Savchuk", "Kuzmenko", "Ponomarenko", "Vasylenko", "Levchenko", "Kharchenko",
+    "O'Connor", "Smith-Jones", "Nowak", "Kowalski", "Wisniewski", "Hoffmann", "Fischer",
+]
+EMAIL_DOMAINS = ["gmail.com", "ukr.net", "outlook.com", "yahoo.com", "i.ua", "icloud.com", "example.com"]
+EMAIL_DOMAIN_WEIGHTS = [45, 20, 12, 8, 6, 5, 4]
+# (prefix, subscriber digits)
+PHONE_FORMATS = [
+    ("+38050", 7), ("+38066", 7), ("+38067", 7), ("+38068", 7), ("+38073", 7),
+    ("+38093", 7), ("+38097", 7), ("+38099", 7), ("+1212", 7), ("+4420", 8),
+]
+NOTES = [
+    "Met at the conference", "Former colleague", "Neighbour", "University friend", "Family",
+    "Dentist", "Call after 6pm", "Prefers email", "Gym buddy", "Client",
+]
+
+# Fixed so that a seed always produces the same birthdays, whatever day the
+# tool runs on.
+REFERENCE_DATE = date(2025, 1, 1)
+SEED_PASSWORD = "seed-password"
+CONTACT_COLUMNS = [
+    "first_name", "last_name", "email", "phone_number", "date_of_birth", "additional_data",
+    "user_id", "phone_digits", "phone_digits_reversed",
+]
+# Columns that come from ContactCreate; the rest are set by the application.
+VALIDATED_COLUMNS = CONTACT_COLUMNS[:6]
+
+
+def zipf_weights(count: int, exponent: float = 1.05) -> list[float]:
+    return [1 / rank ** exponent for rank in range(1, count + 1)]
+
+
+def book_sizes(rng: random.Random, users: int, contacts: int, alpha: float) -> list[int]:
+    # Pareto weights: most books are small, a handful hold a large share.
+    weights = [rng.paretovariate(alpha) for _ in range(users)]
+    scale = contacts / sum(weights)
+    sizes = [int(weight * scale) for weight in weights]
+    for i in sorted(range(users), key=weights.__getitem__, reverse=True)[:contacts - sum(sizes)]:
+        sizes[i] += 1
+    return sizes
+
+
+def email_local_part(first_name: str, last_name: str) -> str:
+    return f"{first_name}.{last_name}".lower().replace("'", "").replace("-", "")
+
+
+def birthday_distribution() -> tuple[list[str], list[float]]:
+    # Ages around 38 years (sd 15), 1 to 95 years before REFERENCE_DATE, as
+    # cumulative weights over every day so sampling is a single bisect.
+    dates, cum_weights, total = [], [], 0.0
+    for days in range(365, 95 * 365):
+        age = days / 365.25
+        total += math.exp(-((age - 38) ** 2) / (2 * 15 ** 2))
+        dates.append((REFERENCE_DATE - timedelta(days=days)).isoformat())
+        cum_weights.append(total)
+    return dates, cum_weights
+
+
+FIRST_NAME_WEIGHTS = zipf_weights(len(FIRST_NAMES))
+LAST_NAME_WEIGHTS = zipf_weights(len(LAST_NAMES))
+BIRTHDAYS, BIRTHDAY_CUM_WEIGHTS = birthday_distribution()
+
+
+def generate_contacts(rng: random.Random, user_id: int, count: int) -> list[tuple]:
+    first_names = rng.choices(FIRST_NAMES, weights=FIRST_NAME_WEIGHTS, k=count)
+    last_names = rng.choices(LAST_NAMES, weights=LAST_NAME_WEIGHTS, k=count)
+    domains = rng.choices(EMAIL_DOMAINS, weights=EMAIL_DOMAIN_WEIGHTS, k=count)
+    phone_formats = rng.choices(PHONE_FORMATS, k=count)
+    birthdays = rng.choices(BIRTHDAYS, cum_weights=BIRTHDAY_CUM_WEIGHTS, k=count)
+    notes = rng.choices(NOTES + [None], weights=[3] * len(NOTES) + [70], k=count)
+    randrange = rng.randrange
+    phones = [f"{prefix}{randrange(10 ** digits):0{digits}d}" for prefix, digits in phone_formats]
+    return [
+        (
+            first_name,
+            last_name,
+            f"{email_local_part(first_name, last_name)}{i}@{domain}",
+            phone,
+            birthday,
+            note,
+            user_id,
+            # Generated numbers are international, so the E.164 digits are
+            # the number without its "+".
+            phone[1:],
+            phone[:0:-1],
+        )
+        for i, (first_name, last_name, domain, phone, birthday, note) in enumerate(
+            zip(first_names, last_names, domains, phones, birthdays, notes)
+        )
+    ]
+
+
+def validate_sample(rows: list[tuple]) -> None:
+    from app.schemas.contact import ContactCreate
+
+    for row in rows:
+        data = dict(zip(VALIDATED_COLUMNS, row))
+        data["date_of_birth"] = date.fromisoformat(data["date_of_birth"])
+        validated = ContactCreate(**data).model_dump()
+        if validated != data:
+            raise SystemExit(f"Generated contact changes under validation: {data} -> {validated}")
+
+
+def copy_contacts(connection, rows: list[tuple]) -> None:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(["\\N" if value is None else value for value in row])
+    buffer.seek(0)
+    with connection.connection.cursor() as cursor:
+        cursor.copy_expert(
+            f"COPY contacts ({', '.join(CONTACT_COLUMNS)}) FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+            buffer,
+        )
+
+
+def load_contacts(engine, contacts_table, rows: list[tuple], validate_sample_size: int) -> None:
+    validate_sample(rows[:validate_sample_size])
+    with engine.begin() as connection:
+        if engine.dialect.name == "postgresql":
+            copy_contacts(connection, rows)
+        elif engine.dialect.positional:
+            if engine.dialect.name == "sqlite":
+                # Bulk load: skip the fsync per transaction.
+                connection.exec_driver_sql("PRAGMA synchronous = OFF")
+            # Straight to the driver's executemany with the row tuples; Core
+            # would build and process a dict per row.
+            statement = insert(contacts_table).compile(dialect=engine.dialect, column_keys=CONTACT_COLUMNS)
+            connection.exec_driver_sql(str(statement), rows)
+        else:
+            connection.execute(insert(contacts_table), [dict(zip(CONTACT_COLUMNS, row)) for row in rows])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--contacts", type=int, default=100_000, help="total contacts across all users")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skew", type=float, default=1.2, help="Pareto alpha of book sizes; lower is more skewed")
+    parser.add_argument("--batch-size", type=int, default=50_000)
+    parser.add_argument("--validate-sample", type=int, default=100,
+                        help="contacts per batch checked against ContactCreate")
+    parser.add_argument("--database-url", help="defaults to DATABASE_URL")
+    parser.add_argument("--create-schema", action="store_true", help="create missing tables first")
+    parser.add_argument("--defer-indexes", action="store_true",
+                        help="drop contacts indexes during the load and rebuild them after (scratch databases)")
+    args = parser.parse_args()
+
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+
+    from app.core.security import get_password_hash
+    from app.db.database import get_engine
+    from app.db.sharding import shard_router
+    from app.domain import account_deletion, contact, user  # noqa: F401 - Import to register models
+    from app.domain.base import metadata_
+    from app.domain.contact import Contact
+    from app.domain.user import User
+
+    # Per-statement slow query warnings are expected for bulk loads.
+    logging.getLogger("app").setLevel(logging.ERROR)
+
+    engine = get_engine()
+    if args.create_schema:
+        metadata_.create_all(engine)
+        if shard_router.enabled:
+            shard_router.create_schema()
+
+    rng = random.Random(args.seed)
+    sizes = book_sizes(rng, args.users, args.contacts, args.skew)
+    hashed_password = get_password_hash(SEED_PASSWORD)
+    users_table, contacts_table = User.__table__, Contact.__table__
+
+    user_rows = []
+    for i, first_name in enumerate(rng.choices(FIRST_NAMES, weights=FIRST_NAME_WEIGHTS, k=args.users)):
+        last_name = rng.choice(LAST_NAMES)
+        user_rows.append({
+            "email": f"{email_local_part(first_name, last_name)}.seed{args.seed}.{i}@example.com",
+            "first_name": first_name,
+            "last_name": last_name,
+            "hashed_password": hashed_password,
+            "is_confirmed": True,
+        })
+
+    with engine.begin() as connection:
+        user_ids = connection.execute(
+            insert(users_table).returning(users_table.c.id, sort_by_parameter_order=True),
+            user_rows,
+        ).scalars().all()
+        if shard_router.enabled:
+            connection.execute(
+                update(users_table)
+                .where(users_table.c.id.in_(user_ids))
+                .values(contact_shard=users_table.c.id % len(shard_router))
+            )
+    print(f"Inserted {len(user_ids)} users")
+
+    # Contacts of sharded users go to their shard, others to the primary.
+    targets = dict(enumerate(shard_router.engines)) if shard_router.enabled else {None: engine}
+    secondary_indexes = [index for index in contacts_table.indexes if index.name != "ix_contacts_id"]
+    if args.defer_indexes:
+        for target in targets.values():
+            for index in secondary_indexes:
+                index.drop(target, checkfirst=True)
+    batches: dict = {shard: [] for shard in targets}
+    started = time.perf_counter()
+    loaded = 0
+    for user_id, size in zip(user_ids, sizes):
+        shard = user_id % len(shard_router) if shard_router.enabled else None
+        batch = batches[shard]
+        batch.extend(generate_contacts(rng, user_id, size))
+        if len(batch) >= args.batch_size:
+            load_contacts(targets[shard], contacts_table, batch, args.validate_sample)
+            loaded += len(batch)
+            batch.clear()
+            print(f"  {loaded:>10} contacts  {loaded / (time.perf_counter() - started):,.0f} rows/s")
+    for shard, batch in batches.items():
+        if batch:
+            load_contacts(targets[shard], contacts_table, batch, args.validate_sample)
+            loaded += len(batch)
+
+    if args.defer_indexes:
+        for target in targets.values():
+            for index in secondary_indexes:
+                index.create(target, checkfirst=True)
+
+    elapsed = time.perf_counter() - started
+    largest = max(sizes, default=0)
+    print(f"Loaded {loaded} contacts in {elapsed:.1f}s ({loaded / elapsed:,.0f} rows/s); largest book {largest}")
+    print(f"Seeded users log in with password '{SEED_PASSWORD}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+"""Contact shard maintenance.
+
+    python -m scripts.shards init [--id-start 1]
+    python -m scripts.shards stats
+    python -m scripts.shards move USER_ID TARGET_SHARD [--from-primary] [--renumber] [--grace-seconds 7]
+    python -m scripts.shards phone-digits
+
+`move` copies the user's contacts to the target shard, flips
+users.contact_shard, replays writes that reached the old shard meanwhile
+and finally deletes the old rows. Users from before sharding have no
+contact_shard and keep their contacts on the primary database, which is
+where `move` takes them from; `--from-primary` forces that for a pinned
+user.
+
+The grace period before the replay must cover requests that resolved the
+old shard just before the flip, including reads whose user row came from
+a lagging replica: with DATABASE_REPLICA_URL set it is at least
+REPLICA_MAX_LAG_SECONDS plus REPLICA_LAG_CHECK_SECONDS.
+
+`phone-digits` adds and backfills the phone_digits columns and their
+indexes on shards created before them (the primary gets them from
+Alembic).
+
+Contact ids are kept. If some are already taken on the target (SQLite
+shards, or data moved from the primary), the move stops unless
+`--renumber` is given, which gives those contacts new ids.
+"""
+import argparse
+import time
+from typing import Optional
+
+from sqlalchemy import MetaData, bindparam, delete, func, inspect, insert, select, text, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.phone import normalize_phone
+from app.db.database import SessionLocal
+from app.db.sharding import shard_contacts_table, shard_router
+from app.domain.contact import Contact
+from app.domain.user import User
+
+contacts = Contact.__table__
+
+CHUNK_SIZE = 500
+
+# Time for requests that resolved the old shard just before the flip to
+# finish.
+IN_FLIGHT_GRACE_SECONDS = 2.0
+
+
+def min_grace_seconds() -> float:
+    # A lagging replica can serve the old users.contact_shard for up to the
+    # allowed lag, plus the time until the lag is measured again.
+    if not settings.database_replica_url:
+        return 0.0
+    return settings.replica_max_lag_seconds + settings.replica_lag_check_seconds
+
+
+def _load(session: Session, user_id: int) -> dict[int, dict]:
+    rows = session.execute(select(contacts).where(contacts.c.user_id == user_id)).mappings()
+    return {row["id"]: dict(row) for row in rows}
+
+
+def _conflicting_ids(session: Session, ids: list[int]) -> list[int]:
+    conflicts = []
+    for start in range(0, len(ids), CHUNK_SIZE):
+        chunk = ids[start:start + CHUNK_SIZE]
+        conflicts += session.scalars(select(contacts.c.id).where(contacts.c.id.in_(chunk))).all()
+    return conflicts
+
+
+def init(id_start: int) -> None:
+    shard_router.create_schema(id_start)
+    print(f"Created contacts schema on {len(shard_router)} shard(s)")
+
+
+def stats() -> None:
+    for shard in range(len(shard_router)):
+        with shard_router.session(shard) as session:
+            users, total = session.execute(
+                select(func.count(func.distinct(contacts.c.user_id)), func.count())
+            ).one()
+        print(f"shard {shard}: {total} contacts, {users} users")
+
+
+def add_phone_digits() -> None:
+    for shard, engine in enumerate(shard_router.engines):
+        existing = {column["name"] for column in inspect(engine).get_columns("contacts")}
+        with engine.begin() as connection:
+            for name in ("phone_digits", "phone_digits_reversed"):
+                if name not in existing:
+                    # Nullable: SQLite cannot add a NOT NULL column without a default.
+                    connection.execute(text(f"ALTER TABLE contacts ADD COLUMN {name} VARCHAR(20)"))
+
+        filled = 0
+        while True:
+            with engine.begin() as connection:
+                rows = connection.execute(
+                    select(contacts.c.id, contacts.c.phone_number)
+                    .where(contacts.c.phone_digits.is_(None))
+                    .limit(CHUNK_SIZE)
+                ).all()
+                if not rows:
+                    break
+                values = []
+                for contact_id, phone_number in rows:
+                    digits = normalize_phone(phone_number)
+                    values.append({"contact_id": contact_id, "digits": digits, "reversed": digits[::-1]})
+                connection.execute(
+                    update(contacts)
+                    .where(contacts.c.id == bindparam("contact_id"))
+                    .values(phone_digits=bindparam("digits"), phone_digits_reversed=bindparam("reversed")),
+                    values,
+                )
+            filled += len(rows)
+
+        table = shard_contacts_table(MetaData(), shard)
+        for index in table.indexes:
+            if "phone_digits" in index.name:
+                index.create(engine, checkfirst=True)
+        print(f"shard {shard}: filled phone digits of {filled} contacts")
+
+
+def _insert(session: Session, row: dict, renumber: bool) -> int:
+    if renumber:
+        row = {key: value for key, value in row.items() if key != "id"}
+    return session.execute(insert(contacts), row).inserted_primary_key[0]
+
+
+def move_user(
+    user_id: int,
+    target: int,
+    from_primary: bool = False,
+    renumber: bool = False,
+    grace_seconds: Optional[float] = None
+) -> None:
+    if not 0 <= target < len(shard_router):
+        raise SystemExit(f"Unknown shard {target}, {len(shard_router)} configured")
+    if grace_seconds is None:
+        grace_seconds = min_grace_seconds() + IN_FLIGHT_GRACE_SECONDS
+    elif grace_seconds < min_grace_seconds():
+        raise SystemExit(f"--grace-seconds must be at least {min_grace_seconds()} with a read replica")
+
+    with SessionLocal() as primary:
+        user = primary.get(User, user_id)
+        if user is None:
+            raise SystemExit(f"User {user_id} not found")
+
+        source_shard = None if from_primary else shard_router.shard_for(user)
+        from_primary = source_shard is None
+        if source_shard == target:
+            print(f"User {user_id} is already on shard {target}")
+            return
+        source = primary if from_primary else shard_router.session(source_shard)
+
+        try:
+            with shard_router.session(target) as target_db:
+                copied = _load(source, user_id)
+                conflicts = set(_conflicting_ids(target_db, list(copied)))
+                if conflicts and not renumber:
+                    raise SystemExit(f"Contact ids already used on shard {target}: {sorted(conflicts)[:20]}")
+                kept = [row for contact_id, row in copied.items() if contact_id not in conflicts]
+                if kept:
+                    target_db.execute(insert(contacts), kept)
+                # Source id -> id on the target shard.
+                target_ids = {row["id"]: row["id"] for row in kept}
+                for contact_id in conflicts:
+                    target_ids[contact_id] = _insert(target_db, copied[contact_id], renumber=True)
+                target_db.commit()
+
+                user.contact_shard = target
+                primary.commit()
+
+                # Requests that resolved the old shard just before the flip may
+                # still write there; wait for them, then replay the difference.
+                time.sleep(grace_seconds)
+                source.rollback()
+                current = _load(source, user_id)
+                removed = [target_ids[contact_id] for contact_id in copied if contact_id not in current]
+                if removed:
+                    target_db.execute(delete(contacts).where(contacts.c.id.in_(removed)))
+                for contact_id, row in current.items():
+                    if contact_id not in copied:
+                        target_ids[contact_id] = _insert(target_db, row, renumber)
+                    elif row != copied[contact_id]:
+                        values = {key: value for key, value in row.items() if key != "id"}
+                        target_db.execute(
+                            update(contacts).where(contacts.c.id == target_ids[contact_id]).values(values)
+                        )
+                target_db.commit()
+
+                source.execute(delete(contacts).where(contacts.c.user_id == user_id))
+                source.commit()
+        finally:
+            if source is not primary:
+                source.close()
+
+    origin = "primary" if from_primary else f"shard {source_shard}"
+    print(f"Moved {len(current)} contacts of user {user_id} from {origin} to shard {target}")
+    renumbered = {old: new for old, new in target_ids.items() if old != new}
+    if renumbered:
+        print(f"Renumbered contact ids: {renumbered}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    init_parser = commands.add_parser("init", help="create the contacts table on every shard")
+    init_parser.add_argument("--id-start", type=int, default=1,
+                             help="first contact id; set above the primary's max id before moving existing data")
+
+    commands.add_parser("stats", help="show contacts and users per shard")
+    commands.add_parser("phone-digits", help="add and backfill the phone_digits columns on existing shards")
+
+    move_parser = commands.add_parser("move", help="move one user's contacts to another shard")
+    move_parser.add_argument("user_id", type=int)
+    move_parser.add_argument("target", type=int)
+    move_parser.add_argument("--from-primary", action="store_true")
+    move_parser.add_argument("--renumber", action="store_true", help="give new ids to contacts whose id is taken")
+    move_parser.add_argument("--grace-seconds", type=float,
+                             help="wait before replaying writes to the old shard (default: replica lag bound + 2)")
+
+    args = parser.parse_args()
+    if not shard_router.enabled:
+        raise SystemExit("CONTACT_SHARD_URLS is not configured")
+
+    if args.command == "init":
+        init(args.id_start)
+    elif args.command == "stats":
+        stats()
+    elif args.command == "phone-digits":
+        add_phone_digits()
+    else:
+        move_user(args.user_id, args.target, args.from_primary, args.renumber, args.grace_seconds)
+
+
+if __name__ == "__main__":
+    main()